@@ -4,7 +4,7 @@ Data cleaning and preprocessing utilities for the Housing Price Prediction Proje
 Designed for the Kaggle House Prices dataset, these functions handle missing values, duplicates, normalization, and encoding to prepare data for modeling.
 
 Functions:
-- fill_missing_values(df, num_strategy='median', cat_strategy='None'): Fills missing values in numeric and categorical columns.
+- fill_missing_values(df, num_strategy='median', cat_strategy='None', inplace=False): Fills missing values in numeric and categorical columns.
   Assumptions: Numeric missing values are random and suitable for median imputation due to skewness; categorical missing values indicate absence (e.g., no basement).
   Rationale: Median is robust to outliers; 'None' aligns with dataset semantics.
 
@@ -25,34 +25,51 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
 
-def fill_missing_values(df, num_strategy='median', cat_strategy='None'):
+def _fill_float_columns(df, fill_values):
+    """Fill NaNs in float64 columns with one masked assignment over their NumPy block; return the other fill values."""
+    cols = [col for col, dtype in df.dtypes.items() if col in fill_values and dtype == np.float64]
+    if cols:
+        vals = df[cols].to_numpy(copy=True)
+        np.copyto(vals, np.array([fill_values[col] for col in cols], dtype=float), where=np.isnan(vals))
+        df.loc[:, cols] = vals
+    return {col: value for col, value in fill_values.items() if col not in cols}
+
+def fill_missing_values(df, num_strategy='median', cat_strategy='None', inplace=False):
     """
     Fill missing values in numeric and categorical columns.
     
+    All fill values are computed in one reduction per dtype block; float columns are filled with one
+    masked array assignment and only the remaining columns go through fillna.
+    
     Args:
         df (pd.DataFrame): Input DataFrame.
         num_strategy (str): Strategy for numeric columns ('mean', 'median').
         cat_strategy (str): Strategy for categorical columns ('None', 'mode').
+        inplace (bool): Fill df itself instead of a copy (default: False).
         
     Returns:
         pd.DataFrame: DataFrame with missing values filled.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     categorical_cols = df.select_dtypes(include=[object]).columns
     
-    for col in numeric_cols:
-        if num_strategy == 'median':
-            df[col].fillna(df[col].median(), inplace=True)
-        elif num_strategy == 'mean':
-            df[col].fillna(df[col].mean(), inplace=True)
+    fill_values = {}
+    if num_strategy == 'median':
+        fill_values.update(df[numeric_cols].median().to_dict())
+    elif num_strategy == 'mean':
+        fill_values.update(df[numeric_cols].mean().to_dict())
     
-    for col in categorical_cols:
-        if cat_strategy == 'None':
-            df[col].fillna('None', inplace=True)
-        elif cat_strategy == 'mode':
-            df[col].fillna(df[col].mode()[0], inplace=True)
+    if cat_strategy == 'None':
+        fill_values.update(dict.fromkeys(categorical_cols, 'None'))
+    elif cat_strategy == 'mode':
+        modes = df[categorical_cols].mode()
+        # No categorical columns (or all of them empty) gives a frame without rows
+        if len(categorical_cols) and len(modes):
+            fill_values.update(modes.iloc[0].to_dict())
     
+    df.fillna(_fill_float_columns(df, fill_values), inplace=True)
     return df
 
 def remove_duplicates(df):
@@ -2,7 +2,7 @@
 Data cleaning utilities for the Housing Price Prediction Project.
 
 Functions:
-- fill_missing_values(df): Handles missing values in numeric and categorical columns.
+- fill_missing_values(df, inplace=False): Handles missing values in numeric and categorical columns.
   Assumptions: Numeric missing values are random and suitable for median imputation; categorical missing values indicate absence.
   Rationale: Median is robust to outliers; 'None' aligns with dataset semantics.
 
@@ -23,24 +23,37 @@ import pandas as pd
 import numpy as np
 from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
 
-def fill_missing_values(df):
+def _fill_float_columns(df, fill_values):
+    """Fill NaNs in float64 columns with one masked assignment over their NumPy block; return the other fill values."""
+    cols = [col for col, dtype in df.dtypes.items() if col in fill_values and dtype == np.float64]
+    if cols:
+        vals = df[cols].to_numpy(copy=True)
+        np.copyto(vals, np.array([fill_values[col] for col in cols], dtype=float), where=np.isnan(vals))
+        df.loc[:, cols] = vals
+    return {col: value for col, value in fill_values.items() if col not in cols}
+
+def fill_missing_values(df, inplace=False):
     """
     Fill missing values in numeric and categorical columns.
     
+    Medians for all numeric columns come from one reduction; float columns are filled with one masked
+    array assignment and the categorical columns with a single fillna.
+    
     Args:
         df (pd.DataFrame): Input DataFrame.
+        inplace (bool): Fill df itself instead of a copy (default: False).
         
     Returns:
         pd.DataFrame: DataFrame with missing values filled.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     categorical_cols = df.select_dtypes(include=[object]).columns
     
-    for col in numeric_cols:
-        df[col].fillna(df[col].median(), inplace=True)
-    for col in categorical_cols:
-        df[col].fillna('None', inplace=True)
+    fill_values = df[numeric_cols].median().to_dict()
+    fill_values.update(dict.fromkeys(categorical_cols, 'None'))
+    df.fillna(_fill_float_columns(df, fill_values), inplace=True)
     
     return df
 
@@ -10,23 +10,38 @@ Functions:
   Assumptions: Missing values are random; median is robust to outliers.
   Rationale: Suitable for skewed distributions.
 
-- SimpleLinReg: A basic linear regression class for fitting and prediction.
+- SimpleLinReg(solver='lstsq', alpha=0.0, chunk_size=None): A basic linear regression class for fitting and prediction.
   Assumptions: Linear relationship between X and y (multi-feature supported).
   Rationale: Provides a lightweight alternative to sklearn.linear_model.
+  solver='cholesky' (normal equations) or 'qr' (streaming QR) accumulate sufficient statistics chunk by chunk,
+  support partial_fit for streaming data and ridge regularization via alpha.
 
-- bootstrap_metric(y_true, y_pred, metric_fn, n_boot=1000): Computes a bootstrap confidence interval for a metric.
+- linear_cv(X, y, cv=5, alpha=0.0, random_state=None): Leave-one-out or k-fold CV errors for SimpleLinReg-style (ridge) linear models.
+  Assumptions: Linear model with an unpenalized intercept; folds are exchangeable.
+  Rationale: LOO uses the hat-matrix shortcut and k-fold subtracts per-fold sufficient statistics,
+  so a full CV costs about one fit instead of k refits.
+
+- bootstrap_metric(y_true, y_pred, metric_fn, n_boot=1000, random_state=None, max_block_elements=2**22): Computes a bootstrap confidence interval for a metric.
   Assumptions: Resamples represent the population distribution.
   Rationale: Quantifies uncertainty without parametric assumptions.
+  MAE, MSE, RMSE, R² and MAPE are evaluated for all resamples at once with array reductions;
+  other metric functions fall back to a per-resample loop.
 
-- scenario_sensitivity(X_raw, y, fit_fn, scenarios): Compares model performance across different data scenarios.
+- scenario_sensitivity(X_raw, y, fit_fn, scenarios, n_jobs=None): Compares model performance across different data scenarios.
   Assumptions: Scenarios capture relevant variations in data handling.
   Rationale: Assesses robustness to imputation or model choices.
+  With n_jobs > 1 scenarios run in a process pool that reads X_raw/y from shared memory.
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
 import numpy as np
 import pandas as pd
-from typing import Callable, Dict
-from sklearn.metrics import mean_absolute_error
+from scipy.linalg import LinAlgError, cho_factor, cho_solve, solve_triangular
+from typing import Callable, Dict, Union
+from sklearn.metrics import (mean_absolute_error, mean_squared_error, root_mean_squared_error, r2_score,
+                             mean_absolute_percentage_error)
 
 def mean_impute(a: np.ndarray) -> np.ndarray:
     """
@@ -58,10 +73,34 @@ def median_impute(a: np.ndarray) -> np.ndarray:
     out[np.isnan(out)] = m
     return out
 
+def _solve_gram(A, b):
+    """Solve A x = b for a symmetric Gram matrix by Cholesky, falling back to lstsq if it is singular."""
+    try:
+        return cho_solve(cho_factor(A), b)
+    except LinAlgError:
+        return np.linalg.lstsq(A, b, rcond=None)[0]  # Singular (e.g., collinear dummies)
+
 class SimpleLinReg:
     """
     A simple linear regression class for fitting and prediction with multi-feature support.
+    
+    Args:
+        solver (str): 'lstsq' (default, least squares on the full design matrix), 'cholesky'
+            (accumulates XᵀX and Xᵀy, solved by Cholesky) or 'qr' (accumulates the R factor of a
+            streaming QR, slower but numerically safer for ill-conditioned features).
+        alpha (float): Ridge penalty on the coefficients (the intercept is not penalized);
+            requires solver 'cholesky' or 'qr'.
+        chunk_size (int): Rows per chunk when fit accumulates statistics (default: all rows at once).
     """
+    def __init__(self, solver='lstsq', alpha=0.0, chunk_size=None):
+        if solver not in ('lstsq', 'cholesky', 'qr'):
+            raise ValueError("solver must be 'lstsq', 'cholesky' or 'qr'.")
+        if alpha and solver == 'lstsq':
+            raise ValueError("Ridge (alpha > 0) requires solver 'cholesky' or 'qr'.")
+        self.solver = solver
+        self.alpha = alpha
+        self.chunk_size = chunk_size
+
     def fit(self, X, y):
         """
         Fit the linear regression model.
@@ -73,11 +112,90 @@ class SimpleLinReg:
         Returns:
             self: Fitted model.
         """
-        X1 = np.c_[np.ones(len(X)), X]  # Add intercept term
-        beta, _, _, _ = np.linalg.lstsq(X1, y, rcond=None)
-        self.intercept_ = float(beta[0])
-        self.coef_ = np.array([float(b) for b in beta[1:]])
-        self.n_features_ = X.shape[1]  # Store number of features
+        if self.solver == 'lstsq':
+            X1 = np.c_[np.ones(len(X)), X]  # Add intercept term
+            beta, _, _, _ = np.linalg.lstsq(X1, y, rcond=None)
+            self.intercept_ = float(beta[0])
+            self.coef_ = np.array([float(b) for b in beta[1:]])
+            self.n_features_ = X.shape[1]  # Store number of features
+            return self
+        self._n = 0
+        step = self.chunk_size or max(len(X), 1)
+        for start in range(0, len(X), step):
+            self._accumulate(X[start:start + step], y[start:start + step])
+        return self._solve()
+
+    def partial_fit(self, X, y):
+        """
+        Update the fit with another chunk of rows (streaming data); the model is usable after every call.
+        
+        Args:
+            X (np.ndarray): Feature chunk (n_chunk, n_features).
+            y (np.ndarray): Target chunk (n_chunk,).
+        
+        Returns:
+            self: Model fitted on all chunks seen so far.
+        """
+        if self.solver == 'lstsq':
+            raise ValueError("partial_fit requires solver 'cholesky' or 'qr'.")
+        if not getattr(self, '_n', 0):
+            self._n = 0
+        self._accumulate(X, y)
+        return self._solve()
+
+    def _accumulate(self, X, y):
+        X = np.asarray(X, dtype=float)
+        y = np.asarray(y, dtype=float).ravel()
+        if X.ndim == 1:
+            X = X.reshape(-1, 1)
+        if len(X) == 0:
+            return
+        p = X.shape[1]
+        if self._n == 0:
+            # Shift by the first chunk's means so the sums below do not lose precision to large offsets
+            self._x_shift, self._y_shift = X.mean(axis=0), y.mean()
+            self._sx, self._sy = np.zeros(p), 0.0
+            self._xtx, self._xty = np.zeros((p, p)), np.zeros(p)
+            self._r = np.zeros((0, p + 2))
+        Xc = X - self._x_shift
+        yc = y - self._y_shift
+        self._n += len(X)
+        if self.solver == 'cholesky':
+            self._sx += Xc.sum(axis=0)
+            self._sy += yc.sum()
+            self._xtx += Xc.T @ Xc
+            self._xty += Xc.T @ yc
+        else:
+            # Streaming (TSQR) update: R of [1 | X | y] for all rows seen so far
+            block = np.column_stack([np.ones(len(Xc)), Xc, yc])
+            self._r = np.linalg.qr(np.vstack([self._r, block]), mode='r')
+
+    def _solve(self):
+        p = len(self._x_shift)
+        if self.solver == 'cholesky':
+            mx, my = self._sx / self._n, self._sy / self._n
+            A = self._xtx - self._n * np.outer(mx, mx)
+            b = self._xty - self._n * mx * my
+            A[np.diag_indices(p)] += self.alpha
+            coef = _solve_gram(A, b)
+            intercept = self._y_shift + my - (self._x_shift + mx) @ coef
+        else:
+            r = self._r
+            if self.alpha:
+                penalty = np.zeros((p, p + 2))
+                penalty[:, 1:p + 1] = np.sqrt(self.alpha) * np.eye(p)
+                r = np.linalg.qr(np.vstack([r, penalty]), mode='r')
+            R, rhs = r[:p + 1, :p + 1], r[:p + 1, p + 1]
+            diag = np.abs(np.diag(R))
+            if len(diag) == p + 1 and diag.min() > diag.max() * 1e-12:
+                beta = solve_triangular(R, rhs)
+            else:
+                beta = np.linalg.lstsq(R, rhs, rcond=None)[0]
+            coef = beta[1:]
+            intercept = self._y_shift + beta[0] - self._x_shift @ coef
+        self.intercept_ = float(intercept)
+        self.coef_ = np.asarray(coef, dtype=float)
+        self.n_features_ = p
         return self
 
     def predict(self, X):
@@ -93,36 +211,181 @@ class SimpleLinReg:
         """
         if X.shape[1] != self.n_features_:
             X = X[:, [0]]  # Use first feature if dimensions mismatch
-        X1 = np.c_[np.ones(len(X)), X]
-        return X1 @ np.r_[self.intercept_, self.coef_[:X.shape[1]]]
+        # Intercept as a scalar add: no copy of X with an extra ones column
+        out = X @ self.coef_[:X.shape[1]]
+        out += self.intercept_
+        return out
 
-def bootstrap_metric(y_true: np.ndarray, y_pred: np.ndarray, metric_fn: Callable, n_boot: int = 1000) -> dict:
+def linear_cv(X: np.ndarray, y: np.ndarray, cv: Union[int, str] = 5, alpha: float = 0.0, random_state=None) -> dict:
+    """
+    Cross-validated errors of a linear model (SimpleLinReg with solver 'cholesky'/'qr') without refitting per fold.
+    
+    Leave-one-out uses the hat-matrix identity e_loo = e / (1 - h_ii). k-fold computes XᵀX and Xᵀy
+    once per fold and solves each training fold from (total - fold) statistics, i.e. k small
+    p x p solves instead of k fits over the data.
+    
+    Args:
+        X (np.ndarray): Feature array (n_samples, n_features).
+        y (np.ndarray): Target array (n_samples,).
+        cv (int or str): Number of folds, or 'loo' for leave-one-out (default: 5).
+        alpha (float): Ridge penalty on the coefficients (intercept not penalized).
+        random_state (int or np.random.Generator): Seed for the k-fold shuffle.
+        
+    Returns:
+        dict: 'mse', 'rmse', 'mae' over all held-out predictions, 'residuals' (held-out y - ŷ per sample)
+        and, for k-fold, 'fold_mse' per fold.
+        
+    Raises:
+        ValueError: If cv is not 'loo' or an integer between 2 and n_samples.
+    """
+    X = np.asarray(X, dtype=float)
+    y = np.asarray(y, dtype=float).ravel()
+    if X.ndim == 1:
+        X = X.reshape(-1, 1)
+    n, p = X.shape
+    Xc = X - X.mean(axis=0)
+    yc = y - y.mean()
+    eye = alpha * np.eye(p)
+    result = {}
+    if cv == 'loo' or cv == n:
+        A = Xc.T @ Xc + eye
+        coef = _solve_gram(A, Xc.T @ yc)
+        resid = yc - Xc @ coef
+        # Leverage of each row, including the 1/n from the intercept
+        h = 1.0 / n + np.einsum('ij,ji->i', Xc, _solve_gram(A, Xc.T))
+        residuals = resid / (1 - h)
+    elif isinstance(cv, (int, np.integer)) and 2 <= cv <= n:
+        folds = np.array_split(np.random.default_rng(random_state).permutation(n), cv)
+        stats = [(len(f), Xc[f].sum(axis=0), yc[f].sum(), Xc[f].T @ Xc[f], Xc[f].T @ yc[f]) for f in folds]
+        total = [sum(s[i] for s in stats) for i in range(5)]
+        residuals = np.empty(n)
+        fold_mse = []
+        for f, fold in zip(folds, stats):
+            n_t, sx, sy, xtx, xty = (t - s for t, s in zip(total, fold))
+            mx, my = sx / n_t, sy / n_t
+            coef = _solve_gram(xtx - n_t * np.outer(mx, mx) + eye, xty - n_t * mx * my)
+            residuals[f] = yc[f] - (my + (Xc[f] - mx) @ coef)
+            fold_mse.append(float(np.mean(residuals[f] ** 2)))
+        result['fold_mse'] = np.array(fold_mse)
+    else:
+        raise ValueError("cv must be 'loo' or an integer between 2 and the number of samples.")
+    result.update({'mse': float(np.mean(residuals ** 2)), 'rmse': float(np.sqrt(np.mean(residuals ** 2))),
+                   'mae': float(np.mean(np.abs(residuals))), 'residuals': residuals})
+    return result
+
+def _boot_mae(t, p):
+    return np.abs(t - p).mean(axis=1)
+
+def _boot_mse(t, p):
+    return ((t - p) ** 2).mean(axis=1)
+
+def _boot_rmse(t, p):
+    return np.sqrt(_boot_mse(t, p))
+
+def _boot_r2(t, p):
+    sse = ((t - p) ** 2).sum(axis=1)
+    sst = ((t - t.mean(axis=1, keepdims=True)) ** 2).sum(axis=1)
+    # Same convention as sklearn's r2_score for a constant target: 1.0 if perfect, else 0.0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(sst == 0, np.where(sse == 0, 1.0, 0.0), 1 - sse / sst)
+
+def _boot_mape(t, p):
+    return (np.abs(t - p) / np.maximum(np.abs(t), np.finfo(np.float64).eps)).mean(axis=1)
+
+# Row-wise versions of the built-in metrics, applied to a (n_resamples, n) block
+VECTORIZED_METRICS = {
+    'mae': _boot_mae,
+    'mse': _boot_mse,
+    'rmse': _boot_rmse,
+    'r2': _boot_r2,
+    'mape': _boot_mape,
+    mean_absolute_error: _boot_mae,
+    mean_squared_error: _boot_mse,
+    root_mean_squared_error: _boot_rmse,
+    r2_score: _boot_r2,
+    mean_absolute_percentage_error: _boot_mape,
+}
+
+def bootstrap_metric(y_true: np.ndarray, y_pred: np.ndarray, metric_fn: Union[Callable, str], n_boot: int = 1000,
+                     random_state=None, max_block_elements: int = 2**22) -> dict:
     """
     Compute bootstrap confidence interval for a metric.
     
+    Resample indices are drawn as (block, n) arrays; built-in metrics are reduced over each block
+    at once, and blocks are sized so a block holds at most max_block_elements values.
+    
     Args:
         y_true (np.ndarray): True target values.
         y_pred (np.ndarray): Predicted values.
-        metric_fn (Callable): Metric function (e.g., mean_absolute_error).
+        metric_fn (Callable or str): Metric function (e.g., mean_absolute_error) or one of
+            'mae', 'mse', 'rmse', 'r2', 'mape'. Other callables are evaluated once per resample.
         n_boot (int): Number of bootstrap resamples (default: 1000).
+        random_state (int or np.random.Generator): Seed or generator for reproducible resamples
+            (default: None, seeded from np.random so np.random.seed still applies).
+        max_block_elements (int): Upper bound on resampled values held in memory per block.
         
     Returns:
         dict: Bootstrap statistics (mean, CI lower, CI upper).
+        
+    Raises:
+        ValueError: If metric_fn is an unknown metric name.
     """
+    if isinstance(metric_fn, str) and metric_fn not in VECTORIZED_METRICS:
+        raise ValueError(f"Unknown metric '{metric_fn}'; use one of 'mae', 'mse', 'rmse', 'r2', 'mape' or a callable.")
+    if random_state is None:
+        random_state = np.random.randint(2**32, dtype=np.uint64)
+    rng = np.random.default_rng(random_state)
+    y_true = np.asarray(y_true, dtype=float)
+    y_pred = np.asarray(y_pred, dtype=float)
     n = len(y_true)
-    metrics = []
-    for _ in range(n_boot):
-        idx = np.random.choice(n, n, replace=True)
-        boot_true = y_true[idx]
-        boot_pred = y_pred[idx]
-        metrics.append(metric_fn(boot_true, boot_pred))
-    metrics = np.array(metrics)
+    try:
+        vectorized = VECTORIZED_METRICS.get(metric_fn)
+    except TypeError:
+        # Unhashable callables (e.g., objects defining __eq__ without __hash__) use the per-resample loop
+        vectorized = None
+    block = max(1, min(n_boot, max_block_elements // max(n, 1)))
+    metrics = np.empty(n_boot)
+    for start in range(0, n_boot, block):
+        stop = min(start + block, n_boot)
+        idx = rng.integers(0, n, size=(stop - start, n))
+        if vectorized is not None:
+            metrics[start:stop] = vectorized(y_true[idx], y_pred[idx])
+        else:
+            for row, boot_idx in enumerate(idx, start=start):
+                metrics[row] = metric_fn(y_true[boot_idx], y_pred[boot_idx])
     mean_metric = np.mean(metrics)
     ci_lower = np.percentile(metrics, 2.5)
     ci_upper = np.percentile(metrics, 97.5)
     return {'mean': mean_metric, 'ci_lower': ci_lower, 'ci_upper': ci_upper}
 
-def scenario_sensitivity(X_raw: np.ndarray, y: np.ndarray, fit_fn: Callable, scenarios: Dict[str, Callable]) -> pd.DataFrame:
+def _run_scenario(name: str, fn: Callable, X_raw: np.ndarray, y: np.ndarray, fit_fn: Callable) -> dict:
+    """Fit and score one scenario; shared by the sequential and process-pool paths."""
+    if name == 'drop_missing' and np.isnan(X_raw).any():
+        mask = ~np.isnan(X_raw).any(axis=1)
+        Xs, ys = X_raw[mask], y[mask]
+    else:
+        Xs, ys = fn(X_raw), y
+    m = fit_fn(Xs, ys)  # Use multi-feature X directly
+    yh = m.predict(Xs)
+    return {'scenario': name, 'mae': mean_absolute_error(ys, yh),
+            'slope': m.coef_[0] if m.coef_.size == 1 else m.coef_[0],
+            'intercept': m.intercept_}
+
+# Worker-side views of the shared X_raw / y, set once per process by _attach_shared
+_shared = {}
+
+def _attach_shared(specs):
+    for key, (shm_name, shape, dtype) in specs.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        arr = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+        arr.flags.writeable = False  # Scenarios must not modify the shared input
+        _shared[key] = (shm, arr)
+
+def _run_scenario_shared(name: str, fn: Callable, fit_fn: Callable) -> dict:
+    return _run_scenario(name, fn, _shared['X'][1], _shared['y'][1], fit_fn)
+
+def scenario_sensitivity(X_raw: np.ndarray, y: np.ndarray, fit_fn: Callable, scenarios: Dict[str, Callable],
+                         n_jobs: int = None) -> pd.DataFrame:
     """
     Compare model performance across different data scenarios.
     
@@ -131,20 +394,31 @@ def scenario_sensitivity(X_raw: np.ndarray, y: np.ndarray, fit_fn: Callable, sce
         y (np.ndarray): Target array.
         fit_fn (Callable): Fitting function (e.g., SimpleLinReg.fit).
         scenarios (Dict[str, Callable]): Dictionary of scenario functions (e.g., mean_impute, drop_missing).
+        n_jobs (int): Worker processes (default: None, run sequentially). With n_jobs > 1, X_raw and y are
+            copied once into shared memory and each worker maps them instead of receiving a pickled copy
+            per scenario; fit_fn and the scenario functions must be picklable (module-level, not lambdas).
         
     Returns:
-        pd.DataFrame: Results with scenario names, MAE, slope, and intercept.
+        pd.DataFrame: Results with scenario names, MAE, slope, and intercept, in the order of scenarios.
     """
-    results = []
-    for name, fn in scenarios.items():
-        if name == 'drop_missing' and np.isnan(X_raw).any():
-            mask = ~np.isnan(X_raw).any(axis=1)
-            Xs, ys = X_raw[mask], y[mask]
-        else:
-            Xs, ys = fn(X_raw), y
-        m = fit_fn(Xs, ys)  # Use multi-feature X directly
-        yh = m.predict(Xs)
-        results.append({'scenario': name, 'mae': mean_absolute_error(ys, yh), 
-                       'slope': m.coef_[0] if m.coef_.size == 1 else m.coef_[0], 
-                       'intercept': m.intercept_})
+    if n_jobs is None or n_jobs <= 1 or len(scenarios) <= 1:
+        return pd.DataFrame([_run_scenario(name, fn, X_raw, y, fit_fn) for name, fn in scenarios.items()])
+    
+    blocks, specs = [], {}
+    try:
+        for key, arr in (('X', X_raw), ('y', y)):
+            arr = np.ascontiguousarray(arr)
+            shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+            blocks.append(shm)
+            np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+            specs[key] = (shm.name, arr.shape, arr.dtype.str)
+        with ProcessPoolExecutor(max_workers=min(n_jobs, len(scenarios)), initializer=_attach_shared,
+                                 initargs=(specs,)) as executor:
+            # map yields results in submission order, so the output order matches scenarios
+            results = list(executor.map(_run_scenario_shared, scenarios.keys(), scenarios.values(),
+                                        [fit_fn] * len(scenarios)))
+    finally:
+        for shm in blocks:
+            shm.close()
+            shm.unlink()
     return pd.DataFrame(results)
@@ -0,0 +1,73 @@
+'''Benchmark clean_task output formats: wall time and peak RSS per run.
+
+Each format runs in a fresh subprocess so peak RSS is not shared between runs.
+Usage: python bench_clean_task.py --input /path/to/train.csv [--rows 1000000] [--chunksize 100000]
+'''
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+def legacy_clean_task(input_path: str, output_path: str) -> None:
+    '''Previous implementation: to_dict(orient='records') plus one pretty-printed json.dumps.'''
+    df = pd.read_csv(input_path)
+    numeric_cols = df.select_dtypes(include=[np.number]).columns
+    df = df.fillna(df[numeric_cols].median())
+    Path(output_path).write_text(json.dumps(df.to_dict(orient='records'), indent=2))
+
+def run_one(mode: str, input_path: str, output_path: str, chunksize: int) -> None:
+    '''Child process entry: run one configuration and print wall time and peak RSS as JSON.'''
+    sys.path.insert(0, str(Path(__file__).resolve().parent))
+    from clean_task import clean_task
+    start = time.perf_counter()
+    if mode == 'legacy':
+        legacy_clean_task(input_path, output_path)
+    else:
+        clean_task(input_path, output_path, chunksize=chunksize)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in KiB on Linux and bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak_mb = peak / 1e6 if sys.platform == 'darwin' else peak / 1024
+    print(json.dumps({'seconds': elapsed, 'peak_rss_mb': peak_mb, 'size_mb': Path(output_path).stat().st_size / 1e6}))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark clean_task output formats')
+    parser.add_argument('--input', required=True, help='Source CSV (rows are repeated up to --rows)')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        run_one(args.child[0], args.child[1], args.child[2], args.chunksize)
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = pd.read_csv(args.input)
+        reps = int(np.ceil(args.rows / len(source)))
+        big = Path(tmp) / 'input.csv'
+        pd.concat([source] * reps, ignore_index=True).iloc[:args.rows].to_csv(big, index=False)
+        del source
+
+        runs = [('legacy', '.json'), ('clean_task', '.json'), ('clean_task', '.jsonl'),
+                ('clean_task', '.parquet'), ('clean_task', '.arrow')]
+        print(f'{args.rows} rows, chunksize={args.chunksize}')
+        print(f'{"mode":<12}{"format":<10}{"seconds":>10}{"peak RSS MB":>14}{"output MB":>12}')
+        for mode, suffix in runs:
+            out = Path(tmp) / f'{mode}{suffix}'
+            result = subprocess.run(
+                [sys.executable, __file__, '--input', args.input, '--chunksize', str(args.chunksize),
+                 '--child', mode, str(big), str(out)],
+                capture_output=True, text=True, check=True)
+            stats = json.loads(result.stdout.strip().splitlines()[-1])
+            print(f'{mode:<12}{suffix:<10}{stats["seconds"]:>10.2f}{stats["peak_rss_mb"]:>14.0f}{stats["size_mb"]:>12.0f}')
+            out.unlink()
+
+if __name__ == '__main__':
+    main()
@@ -1,31 +1,124 @@
 import argparse
-import json
 import logging
 import sys
 from pathlib import Path
 from datetime import datetime
 
-def clean_task(input_path: str, output_path: str) -> None:
-    '''Clean raw data by handling missing values and saving to JSON.'''
+import numpy as np
+import pandas as pd
+
+OUTPUT_FORMATS = ('.json', '.jsonl', '.ndjson', '.parquet', '.arrow', '.feather')
+WRITE_ROWS = 50_000  # Rows serialized per slice when the whole file is cleaned in memory
+
+def sample_medians(input_path: str, chunksize: int, sample_size: int = 100_000, seed: int = 0):
+    '''First pass: approximate numeric medians from a uniform row sample of bounded size.
+
+    Also returns the columns read as text in any chunk, so the second pass can keep their dtype stable.
+    '''
+    rng = np.random.default_rng(seed)
+    sample = None
+    text_cols = set()
+    for chunk in pd.read_csv(input_path, chunksize=chunksize):
+        text_cols.update(chunk.columns.difference(chunk.select_dtypes(include=[np.number]).columns))
+        numeric = chunk.select_dtypes(include=[np.number]).assign(_key=rng.random(len(chunk)))
+        sample = numeric if sample is None else pd.concat([sample, numeric])
+        # Keeping the rows with the largest random keys is a reservoir sample across chunks
+        sample = sample.nlargest(sample_size, '_key')
+    medians = sample.drop(columns='_key').median()
+    return medians.drop(list(text_cols), errors='ignore'), sorted(text_cols)
+
+def iter_clean_chunks(input_path: str, chunksize: int = None):
+    '''Yield cleaned DataFrames: the whole file in slices of WRITE_ROWS rows, or chunks of chunksize rows.'''
+    if chunksize is None:
+        df = pd.read_csv(input_path)
+        # Simple cleaning: fill NA with median
+        numeric_cols = df.select_dtypes(include=[np.number]).columns
+        df = df.fillna(df[numeric_cols].median())
+        # Slices keep the writer streaming: no single output string for the whole frame
+        for start in range(0, max(len(df), 1), WRITE_ROWS):
+            yield df.iloc[start:start + WRITE_ROWS]
+        return
+    medians, text_cols = sample_medians(input_path, chunksize)
+    for chunk in pd.read_csv(input_path, chunksize=chunksize, dtype=dict.fromkeys(text_cols, object)):
+        chunk = chunk.fillna(medians)
+        # Same dtype in every chunk, whether or not a chunk happened to contain missing values
+        chunk[medians.index] = chunk[medians.index].astype(float)
+        yield chunk
+
+def _arrow_tables(chunks):
+    import pyarrow as pa
+    schema = None
+    for chunk in chunks:
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        if schema is None:
+            # A column that is entirely missing in the first chunk is still text in later ones
+            schema = pa.schema([f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema])
+        yield table.cast(schema)
+
+def write_chunks(chunks, output_path: str) -> None:
+    '''Write cleaned chunks incrementally in the format given by the output suffix.
+
+    .json writes one JSON array, .jsonl/.ndjson one record per line, .parquet a Parquet file
+    and .arrow/.feather an Arrow IPC file. No per-row Python dicts are built.
+    '''
+    suffix = Path(output_path).suffix.lower()
+    if suffix not in OUTPUT_FORMATS:
+        raise ValueError(f'Output must end with one of {", ".join(OUTPUT_FORMATS)}')
+    if suffix in ('.json', '.jsonl', '.ndjson'):
+        with open(output_path, 'w') as f:
+            if suffix == '.json':
+                f.write('[')
+            first = True
+            for chunk in chunks:
+                if suffix == '.json':
+                    records = chunk.to_json(orient='records')[1:-1]
+                    if records:
+                        f.write(records if first else ',' + records)
+                        first = False
+                elif len(chunk):
+                    f.write(chunk.to_json(orient='records', lines=True).rstrip('\n') + '\n')
+            if suffix == '.json':
+                f.write(']')
+        return
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise ImportError("Missing 'pyarrow' library. Install it to write Parquet/Arrow files.")
+    writer = None
+    try:
+        for table in _arrow_tables(chunks):
+            if writer is None:
+                if suffix == '.parquet':
+                    writer = pq.ParquetWriter(output_path, table.schema)
+                else:
+                    writer = pa.ipc.new_file(output_path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+
+def clean_task(input_path: str, output_path: str, chunksize: int = None) -> None:
+    '''Clean raw data by handling missing values and saving as JSON, NDJSON, Parquet or Arrow.
+
+    With chunksize set, the CSV is read in two passes of chunksize rows (medians from a bounded
+    sample, then fill and write), so memory does not grow with the input file.
+    '''
     logging.info('[clean_task] start')
-    df = pd.read_csv(input_path)
-    # Simple cleaning: fill NA with median
-    numeric_cols = df.select_dtypes(include=[np.number]).columns
-    for col in numeric_cols:
-        df[col].fillna(df[col].median(), inplace=True)
-    result = df.to_dict(orient='records')
     Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    Path(output_path).write_text(json.dumps(result, indent=2))
+    write_chunks(iter_clean_chunks(input_path, chunksize), output_path)
     logging.info('[clean_task] wrote %s', output_path)
 
 def main(argv=None):
     parser = argparse.ArgumentParser(description='Clean raw housing data')
     parser.add_argument('--input', required=True, help='Input CSV file path')
-    parser.add_argument('--output', required=True, help='Output JSON file path')
+    parser.add_argument('--output', required=True,
+                        help='Output file path; suffix selects the format (.json, .jsonl/.ndjson, .parquet, .arrow/.feather)')
+    parser.add_argument('--chunksize', type=int, default=None, help='Process the input in chunks of this many rows')
     args = parser.parse_args(argv)
     logging.basicConfig(level=logging.INFO, handlers=[logging.StreamHandler(sys.stdout)])
-    clean_task(args.input, args.output)
+    clean_task(args.input, args.output, chunksize=args.chunksize)
 
 if __name__ == '__main__':
-    main(['--input', '/Users/junshao/bootcamp_Jun_Shao/homework/hw15/data/raw/train.csv', 
+    main(['--input', '/Users/junshao/bootcamp_Jun_Shao/homework/hw15/data/raw/train.csv',
           '--output', '/Users/junshao/bootcamp_Jun_Shao/homework/hw15/data/processed/prices_clean.json'])
@@ -1,25 +1,44 @@
-from flask import Flask, jsonify, request
-import joblib
+import os
+# Non-interactive backend for any matplotlib import in the service (no GUI toolkit at startup)
+os.environ.setdefault('MPLBACKEND', 'Agg')
+
+from flask import Flask, Response, jsonify, request
+from werkzeug.exceptions import BadRequest
 import numpy as np
-import matplotlib.pyplot as plt
 import io
-import base64
+import hashlib
 import threading
-import os
-from dotenv import load_dotenv
+from datetime import datetime, timezone
 
-# Load environment variables
-load_dotenv()
+# Load environment variables (python-dotenv is optional in deployments that set them directly)
+try:
+    from dotenv import load_dotenv
+    load_dotenv()
+except ImportError:
+    pass
 MODEL_DIR = os.getenv('MODEL_DIR', '/Users/junshao/bootcamp_Jun_Shao/homework/hw13/model')  # Default path
 
 app = Flask(__name__)
 
-# Load pickled model once at startup
+# Load the model once at startup: memory-mapped coefficient arrays (see model_artifacts.py) when
+# exported from the current pickle, so workers share one page-cache copy and skip unpickling;
+# otherwise the pickle itself
+MODEL_PATH = os.path.join(MODEL_DIR, 'linear_model.pkl')
 try:
-    model = joblib.load(os.path.join(MODEL_DIR, 'linear_model.pkl'))
+    model = None
+    if os.path.exists(os.path.join(MODEL_DIR, 'coef.npy')):
+        from model_artifacts import load_model_arrays
+        try:
+            model = load_model_arrays(MODEL_DIR, mmap_mode='r',
+                                      source_path=MODEL_PATH if os.path.exists(MODEL_PATH) else None)
+        except ValueError as e:
+            print(f"Warning: {e}; loading {MODEL_PATH} instead")
+    if model is None:
+        import joblib
+        model = joblib.load(MODEL_PATH)
     print(f"Model loaded with {model.n_features_in_} features")
-except FileNotFoundError:
-    print(f"Error: Model file not found at {os.path.join(MODEL_DIR, 'linear_model.pkl')}")
+except FileNotFoundError as e:
+    print(f"Error: Model file not found at {e.filename}")
     exit(1)
 except Exception as e:
     print(f"Error loading model: {str(e)}")
@@ -29,6 +48,15 @@ except Exception as e:
 n_features = model.n_features_in_
 print(f"Expected number of features: {n_features}")
 
+# R² values shown by /plot; the chart is re-rendered only when these change
+PLOT_METRICS = [0.68, 0.714, 0.712]
+_plot_cache = {}
+_plot_lock = threading.Lock()
+
+# Binary batch formats for /predict/batch
+NPY_MIMETYPE = 'application/x-npy'
+ARROW_MIMETYPE = 'application/vnd.apache.arrow.stream'
+
 @app.route('/predict', methods=['POST'])
 def predict():
     """
@@ -53,6 +81,78 @@ def predict():
     except Exception as e:
         return jsonify({'error': f'Prediction failed: {str(e)}', 'status': 500}), 500
 
+def read_batch():
+    """
+    Parse the /predict/batch request body into a 2-D float array.
+    
+    Returns:
+        tuple: (np.ndarray of shape (n_rows, n_cols), format name 'json', 'npy' or 'arrow').
+    """
+    if request.mimetype == NPY_MIMETYPE:
+        data = np.load(io.BytesIO(request.get_data()), allow_pickle=False)
+        if not isinstance(data, np.ndarray):
+            # e.g., an .npz archive, which np.load returns as an NpzFile
+            raise ValueError('body must be a single .npy array')
+        return data.astype(float, copy=False), 'npy'
+    if request.mimetype == ARROW_MIMETYPE:
+        import pyarrow as pa
+        table = pa.ipc.open_stream(request.get_data()).read_all()
+        return np.column_stack([col.to_numpy(zero_copy_only=False) for col in table.columns]).astype(float), 'arrow'
+    data = request.get_json(force=True)
+    features = data.get('features') if isinstance(data, dict) else None
+    if features is None:
+        raise KeyError('No features provided')
+    return np.asarray(features, dtype=float), 'json'
+
+def write_batch(preds, fmt):
+    """
+    Serialize batch predictions in the same format as the request.
+    
+    Args:
+        preds (np.ndarray): Predicted values (n_rows,).
+        fmt (str): 'json', 'npy' or 'arrow'.
+    """
+    if fmt == 'npy':
+        buf = io.BytesIO()
+        np.save(buf, preds)
+        return Response(buf.getvalue(), mimetype=NPY_MIMETYPE)
+    if fmt == 'arrow':
+        import pyarrow as pa
+        table = pa.table({'prediction': preds})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        return Response(sink.getvalue().to_pybytes(), mimetype=ARROW_MIMETYPE)
+    return jsonify({'predictions': preds.tolist(), 'count': int(preds.shape[0])})
+
+@app.route('/predict/batch', methods=['POST'])
+def predict_batch():
+    """
+    POST /predict/batch with many feature vectors; runs one vectorized model.predict.
+    
+    Request: JSON {'features': [[float, ...], ...]}, a NumPy .npy array (Content-Type: application/x-npy)
+             or an Arrow IPC stream with one column per feature (Content-Type: application/vnd.apache.arrow.stream).
+             Each row must have model.n_features_in_ values.
+    Response: Same format as the request; JSON is {'predictions': [float, ...], 'count': int},
+              .npy is a 1-D float array, Arrow is a stream with a 'prediction' column.
+              Errors are {'error': str, 'status': int}.
+    """
+    try:
+        X, fmt = read_batch()
+        if X.ndim != 2 or X.shape[1] != n_features:
+            return jsonify({'error': f'Expected a 2-D array with {n_features} columns, got shape {list(X.shape)}',
+                            'status': 400}), 400
+        preds = np.asarray(model.predict(X), dtype=float)
+        return write_batch(preds, fmt)
+    except BadRequest:
+        return jsonify({'error': 'Invalid JSON body', 'status': 400}), 400
+    except KeyError as e:
+        return jsonify({'error': str(e).strip("'"), 'status': 400}), 400
+    except ValueError as e:
+        return jsonify({'error': f'Invalid feature values: {str(e)}', 'status': 400}), 400
+    except Exception as e:
+        return jsonify({'error': f'Prediction failed: {str(e)}', 'status': 500}), 500
+
 @app.route('/predict/<float:input1>', methods=['GET'])
 def predict_one(input1):
     """
@@ -88,25 +188,57 @@ def predict_two(input1, input2):
     except Exception as e:
         return jsonify({'error': f'Prediction failed: {str(e)}', 'status': 500}), 500
 
-@app.route('/plot')
-def plot():
+def render_plot(metrics):
     """
-    GET /plot to return a simple chart.
-    Displays a sample R² trend based on model performance.
+    Render the R² trend chart to PNG bytes, reusing the cached render while metrics are unchanged.
     
-    Response: HTML with embedded PNG image.
+    Args:
+        metrics (list): R² value per scenario.
+        
+    Returns:
+        dict: {'png': bytes, 'etag': str, 'last_modified': datetime}.
     """
-    try:
-        fig, ax = plt.subplots()
-        ax.plot([0, 1, 2], [0.68, 0.714, 0.712])
+    key = tuple(metrics)
+    with _plot_lock:
+        cached = _plot_cache.get('entry')
+        if cached is not None and cached['key'] == key:
+            return cached
+        # matplotlib is only needed here, so it is not imported at service start
+        from matplotlib.figure import Figure
+        # A Figure built without pyplot is never registered globally and is freed with its last reference
+        fig = Figure()
+        ax = fig.subplots()
+        ax.plot(range(len(metrics)), metrics)
         ax.set_title('Sample R² Trend')
         ax.set_xlabel('Scenario')
         ax.set_ylabel('R²')
         buf = io.BytesIO()
         fig.savefig(buf, format='png')
-        buf.seek(0)
-        img_bytes = base64.b64encode(buf.read()).decode('utf-8')
-        return f'<img src="data:image/png;base64,{img_bytes}"/>'
+        fig.clear()
+        png = buf.getvalue()
+        entry = {'key': key, 'png': png, 'etag': hashlib.sha1(png).hexdigest(),
+                 'last_modified': datetime.now(timezone.utc).replace(microsecond=0)}
+        _plot_cache['entry'] = entry
+        return entry
+
+@app.route('/plot')
+def plot():
+    """
+    GET /plot to return a simple chart.
+    Displays a sample R² trend based on model performance.
+    
+    The PNG is rendered once and cached until PLOT_METRICS change; clients revalidating with
+    If-None-Match / If-Modified-Since get 304 Not Modified.
+    
+    Response: PNG image (image/png) with ETag and Last-Modified headers.
+    """
+    try:
+        entry = render_plot(PLOT_METRICS)
+        response = Response(entry['png'], mimetype='image/png')
+        response.set_etag(entry['etag'])
+        response.last_modified = entry['last_modified']
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': f'Plot generation failed: {str(e)}', 'status': 500}), 500
 
@@ -0,0 +1,66 @@
+"""
+Import-time benchmark for the serving app and the model helpers.
+
+Runs `python -X importtime -c "import <module>"` in fresh interpreters, reports the best of
+several runs plus the module's heaviest direct imports, and exits non-zero when a module is over budget.
+
+Usage: python bench_import_time.py [--runs 5] [--app-budget 2.0] [--utils-budget 0.6]
+Importing app also loads the model, so MODEL_DIR must point at a directory with linear_model.pkl.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+
+def import_profile(module, cwd):
+    """
+    Import a module in a fresh interpreter with -X importtime.
+
+    Returns:
+        tuple: (total seconds, list of (seconds, name) for the module's direct imports).
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=cwd, capture_output=True, text=True, env=os.environ.copy())
+    if result.returncode != 0:
+        raise RuntimeError(f'import {module} failed:\n{result.stderr[-2000:]}')
+    total, children = None, []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        if depth == 0:
+            # A finished top-level import; its direct imports were listed just before it
+            if name.strip() == module:
+                total = int(cumulative) / 1e6
+                break
+            children = []
+        elif depth == 1:
+            children.append((int(cumulative) / 1e6, name.strip()))
+    return total, sorted(children, reverse=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Measure import time of app.py and notebooks/utils.py')
+    parser.add_argument('--runs', type=int, default=5, help='Fresh interpreters per module (best run is reported)')
+    parser.add_argument('--app-budget', type=float, default=2.0, help='Budget in seconds for import app')
+    parser.add_argument('--utils-budget', type=float, default=0.6, help='Budget in seconds for import utils')
+    parser.add_argument('--top', type=int, default=8, help='Number of heaviest imports to list')
+    args = parser.parse_args(argv)
+
+    over_budget = False
+    for module, cwd, budget in [('utils', HERE / 'notebooks', args.utils_budget), ('app', HERE, args.app_budget)]:
+        runs = [import_profile(module, cwd) for _ in range(args.runs)]
+        total, top_level = min(runs, key=lambda run: run[0])
+        status = 'OK' if total <= budget else 'OVER BUDGET'
+        over_budget |= total > budget
+        print(f'import {module}: {total:.3f}s (budget {budget:.2f}s) {status}')
+        for seconds, name in top_level[:args.top]:
+            print(f'    {seconds:7.3f}s  {name}')
+    sys.exit(1 if over_budget else 0)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+"""
+Startup and memory benchmark: pickled model + CSV features vs memory-mapped .npy artifacts.
+
+Starts --procs worker processes at once per mode. Each one loads the model and a feature matrix of --rows rows,
+scores every row and then waits. Once all of them are up, RSS and PSS (proportional set size, where
+shared pages are split between the processes mapping them; Linux only) are read from /proc.
+
+Usage: MODEL_DIR=model python bench_model_load.py [--rows 200000] [--procs 4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+HERE = Path(__file__).resolve().parent
+
+def child(mode, model_dir, features_path):
+    """Worker entry: load, score all rows, print timings as JSON and block until stdin closes."""
+    start = time.perf_counter()
+    if mode == 'pickle':
+        import joblib
+        import pandas as pd
+        model = joblib.load(os.path.join(model_dir, 'linear_model.pkl'))
+        X = pd.read_csv(features_path).to_numpy()
+    else:
+        sys.path.insert(0, str(HERE))
+        from model_artifacts import load_feature_matrix, load_model_arrays
+        model = load_model_arrays(model_dir)
+        X = load_feature_matrix(features_path)
+    load_seconds = time.perf_counter() - start
+    preds = model.predict(X)
+    print(json.dumps({'load_seconds': load_seconds, 'total_seconds': time.perf_counter() - start,
+                      'checksum': float(np.sum(preds))}), flush=True)
+    sys.stdin.read()
+
+def memory_kb(pid):
+    """(RSS, PSS) in KiB from /proc/<pid>/smaps_rollup, or (None, None) where unavailable."""
+    try:
+        values = {}
+        for line in Path(f'/proc/{pid}/smaps_rollup').read_text().splitlines():
+            parts = line.split()
+            if parts[0] in ('Rss:', 'Pss:'):
+                values[parts[0]] = int(parts[1])
+        return values['Rss:'], values['Pss:']
+    except (OSError, KeyError):
+        return None, None
+
+def run_mode(mode, procs, model_dir, features_path):
+    workers = [subprocess.Popen([sys.executable, __file__, '--child', mode, model_dir, features_path],
+                                stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+               for _ in range(procs)]
+    results = [json.loads(worker.stdout.readline()) for worker in workers]
+    memory = [memory_kb(worker.pid) for worker in workers]
+    for worker in workers:
+        worker.stdin.close()
+        worker.wait()
+    return results, memory
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Compare pickle/CSV loading with memory-mapped .npy artifacts')
+    parser.add_argument('--rows', type=int, default=200_000, help='Rows in the synthetic feature matrix')
+    parser.add_argument('--procs', type=int, default=4, help='Concurrent worker processes per mode')
+    parser.add_argument('--child', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.child:
+        child(*args.child)
+        return
+
+    import joblib
+    import pandas as pd
+    from model_artifacts import save_feature_matrix, save_model_arrays
+    model_dir = os.getenv('MODEL_DIR', str(HERE / 'model'))
+    model = joblib.load(os.path.join(model_dir, 'linear_model.pkl'))
+    with tempfile.TemporaryDirectory() as tmp:
+        save_model_arrays(model, tmp)
+        X = pd.DataFrame(np.random.default_rng(0).normal(size=(args.rows, model.n_features_in_)),
+                         columns=[f'f{i}' for i in range(model.n_features_in_)])
+        csv_path, npy_path = os.path.join(tmp, 'features.csv'), os.path.join(tmp, 'features.npy')
+        X.to_csv(csv_path, index=False)
+        save_feature_matrix(X, npy_path)
+        del X
+        # Same model in both modes: pickle workers read MODEL_DIR, mmap workers the exported arrays
+        runs = [('pickle', model_dir, csv_path), ('mmap', tmp, npy_path)]
+        print(f'{args.rows} rows x {model.n_features_in_} features, {args.procs} concurrent processes')
+        print(f'{"mode":<8}{"load s":>9}{"total s":>9}{"RSS MB/proc":>13}{"PSS MB total":>14}')
+        for mode, mdir, path in runs:
+            results, memory = run_mode(mode, args.procs, mdir, path)
+            load = np.median([r['load_seconds'] for r in results])
+            total = np.median([r['total_seconds'] for r in results])
+            rss = [m[0] for m in memory if m[0] is not None]
+            pss = [m[1] for m in memory if m[1] is not None]
+            rss_text = f'{np.mean(rss) / 1024:13.0f}' if rss else f'{"n/a":>13}'
+            pss_text = f'{sum(pss) / 1024:14.0f}' if pss else f'{"n/a":>14}'
+            print(f'{mode:<8}{load:9.3f}{total:9.3f}{rss_text}{pss_text}')
+
+if __name__ == '__main__':
+    main()
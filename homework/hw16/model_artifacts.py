@@ -0,0 +1,148 @@
+"""
+Memory-mappable artifacts for the linear model and pre-encoded feature matrices.
+
+A pickled scikit-learn model has to be unpickled (and scikit-learn imported) by every process that
+uses it. Here the coefficients are plain .npy files opened with np.load(mmap_mode='r'): loading
+costs no deserialization, and all server workers and batch jobs on a host share one page-cache copy.
+
+Functions:
+- save_model_arrays(model, model_dir, feature_names=None, source_path=None): Write coef.npy, intercept.npy and
+  model_meta.json (with the SHA-256 of the pickle the arrays were exported from).
+- load_model_arrays(model_dir, mmap_mode='r', source_path=None): Load them as a LinearModelArrays with predict(),
+  refusing arrays that are stale relative to source_path.
+- file_sha256(path): SHA-256 of a file's content.
+- save_feature_matrix(X, path): Write an encoded feature matrix (DataFrame or array) as a float64 .npy.
+- load_feature_matrix(path, mmap_mode='r'): Memory-map a saved feature matrix.
+
+Usage: python model_artifacts.py model/linear_model.pkl  (exports the arrays next to the pickle)
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+import numpy as np
+
+def file_sha256(path):
+    """SHA-256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+class LinearModelArrays:
+    """
+    Prediction-only linear model backed by (memory-mapped) coefficient arrays.
+
+    Exposes the parts of the scikit-learn API that app.py uses: n_features_in_ and predict().
+    """
+    def __init__(self, coef, intercept, feature_names=None):
+        self.coef_ = coef
+        self.intercept_ = intercept
+        self.n_features_in_ = coef.shape[0]
+        self.feature_names = feature_names
+
+    def predict(self, X):
+        X = np.asarray(X, dtype=float)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f'X has shape {X.shape}, expected (n_rows, {self.n_features_in_})')
+        return X @ self.coef_ + self.intercept_
+
+def save_model_arrays(model, model_dir, feature_names=None, source_path=None):
+    """
+    Export a fitted linear model's coefficients as .npy files.
+
+    Args:
+        model: Fitted single-target linear model with coef_ and intercept_ (e.g., LinearRegression).
+        model_dir (str): Directory to write coef.npy, intercept.npy and model_meta.json to.
+        feature_names (list): Feature order (default: model.feature_names_in_ when available).
+        source_path (str): Pickle the model was loaded from; its hash is recorded so load_model_arrays
+            can detect arrays left over from an older model.
+
+    Returns:
+        str: model_dir.
+
+    Raises:
+        ValueError: If the model has no coef_/intercept_ or predicts several targets.
+    """
+    if not hasattr(model, 'coef_') or not hasattr(model, 'intercept_'):
+        raise ValueError('Only linear models with coef_ and intercept_ can be exported as arrays')
+    coef = np.asarray(model.coef_, dtype=np.float64)
+    if coef.ndim == 2 and coef.shape[0] == 1:
+        coef = coef[0]
+    if coef.ndim != 1:
+        raise ValueError('Only single-target models can be exported as arrays')
+    if feature_names is None and hasattr(model, 'feature_names_in_'):
+        feature_names = list(model.feature_names_in_)
+    os.makedirs(model_dir, exist_ok=True)
+    np.save(os.path.join(model_dir, 'coef.npy'), np.ascontiguousarray(coef))
+    np.save(os.path.join(model_dir, 'intercept.npy'), np.asarray(model.intercept_, dtype=np.float64).reshape(()))
+    meta = {'n_features': int(coef.shape[0]), 'feature_names': feature_names,
+            'source_sha256': file_sha256(source_path) if source_path is not None else None}
+    with open(os.path.join(model_dir, 'model_meta.json'), 'w') as f:
+        json.dump(meta, f, indent=2)
+    return model_dir
+
+def load_model_arrays(model_dir, mmap_mode='r', source_path=None):
+    """
+    Load a model exported with save_model_arrays.
+
+    Args:
+        model_dir (str): Directory containing coef.npy, intercept.npy and model_meta.json.
+        mmap_mode (str): Passed to np.load; 'r' maps the coefficients read-only (None reads them into memory).
+        source_path (str): Current model pickle; when given, the arrays must have been exported from it.
+
+    Returns:
+        LinearModelArrays: Model with predict() and n_features_in_.
+
+    Raises:
+        ValueError: If source_path does not match the pickle the arrays were exported from (e.g., the model
+            was retrained and re-pickled without re-exporting).
+    """
+    with open(os.path.join(model_dir, 'model_meta.json')) as f:
+        meta = json.load(f)
+    if source_path is not None and meta.get('source_sha256') != file_sha256(source_path):
+        raise ValueError(f'Arrays in {model_dir} were not exported from {source_path}; '
+                         f're-run model_artifacts.py to refresh them')
+    coef = np.load(os.path.join(model_dir, 'coef.npy'), mmap_mode=mmap_mode, allow_pickle=False)
+    intercept = float(np.load(os.path.join(model_dir, 'intercept.npy'), allow_pickle=False))
+    return LinearModelArrays(coef, intercept, meta.get('feature_names'))
+
+def save_feature_matrix(X, path):
+    """
+    Save an encoded feature matrix as a C-contiguous float64 .npy file for memory-mapped scoring.
+
+    Args:
+        X (pd.DataFrame or np.ndarray): Features in the model's column order (dense).
+        path (str): Output path ending in .npy.
+
+    Returns:
+        str: path. Column names of a DataFrame are written to <path>.columns.json.
+    """
+    if hasattr(X, 'columns'):
+        with open(f'{path}.columns.json', 'w') as f:
+            json.dump([str(col) for col in X.columns], f)
+        X = X.to_numpy(dtype=np.float64)
+    np.save(path, np.ascontiguousarray(X, dtype=np.float64))
+    return path
+
+def load_feature_matrix(path, mmap_mode='r'):
+    """
+    Open a feature matrix saved with save_feature_matrix without reading it into memory.
+
+    Args:
+        path (str): .npy file.
+        mmap_mode (str): Passed to np.load ('r' for a read-only shared mapping).
+
+    Returns:
+        np.ndarray: Memory-mapped (n_rows, n_features) array; rows are paged in as they are used.
+    """
+    return np.load(path, mmap_mode=mmap_mode, allow_pickle=False)
+
+if __name__ == '__main__':
+    import joblib
+    pkl_path = sys.argv[1] if len(sys.argv) > 1 else os.path.join('model', 'linear_model.pkl')
+    out_dir = save_model_arrays(joblib.load(pkl_path), os.path.dirname(pkl_path) or '.', source_path=pkl_path)
+    print(f'Exported coefficient arrays to {out_dir}')
@@ -2,32 +2,42 @@
 Reusable functions for the Housing Price Prediction Project.
 
 Functions:
-- fill_missing_values(df): Handles missing values in numeric and categorical columns.
+- fill_missing_values(df, inplace=False): Handles missing values in numeric and categorical columns.
 - remove_duplicates(df): Removes duplicate rows.
 - scale_numeric_features(df, columns=None): Applies Min-Max scaling to numeric columns.
-- encode_categorical_features(df, columns=None): One-hot encodes categorical columns.
-- train_model(df): Trains a linear regression model on preprocessed data.
+- encode_categorical_features(df, columns=None, sparse=False): One-hot encodes categorical columns.
+- to_sparse_matrix(df): Converts a feature frame with dense and sparse columns to a SciPy CSR matrix.
+- train_model(df, preprocessor=None, sparse=False): Trains a linear regression model on preprocessed data.
 - save_model(model, path): Pickles the trained model.
 - get_features(df): Returns consistent feature list for prediction.
-- preprocess_test_data(df, features): Preprocesses test data to match training features.
+- preprocess_test_data(df, features, preprocessor=None): Preprocesses test data to match training features.
+- HousePricePreprocessor: Fit-once preprocessing (fill missing, scaling, encoding, LotArea_squared) for training and inference.
+- save_preprocessor(preprocessor, path) / load_preprocessor(path): Persist the fitted preprocessor next to the model.
 """
 
 import pandas as pd
 import numpy as np
-from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error, r2_score
-import joblib
 
-def fill_missing_values(df):
-    df = df.copy()
+# scikit-learn, SciPy and joblib are imported inside the functions that use them so that
+# importing this module (e.g., in the serving app) stays fast.
+
+def _fill_float_columns(df, fill_values):
+    """Fill NaNs in float64 columns with one masked assignment over their NumPy block; return the other fill values."""
+    cols = [col for col, dtype in df.dtypes.items() if col in fill_values and dtype == np.float64]
+    if cols:
+        vals = df[cols].to_numpy(copy=True)
+        np.copyto(vals, np.array([fill_values[col] for col in cols], dtype=float), where=np.isnan(vals))
+        df.loc[:, cols] = vals
+    return {col: value for col, value in fill_values.items() if col not in cols}
+
+def fill_missing_values(df, inplace=False):
+    if not inplace:
+        df = df.copy()
     numeric_cols = df.select_dtypes(include=[np.number]).columns
     categorical_cols = df.select_dtypes(include=[object]).columns
-    for col in numeric_cols:
-        df[col].fillna(df[col].median(), inplace=True)
-    for col in categorical_cols:
-        df[col].fillna('None', inplace=True)
+    fill_values = df[numeric_cols].median().to_dict()
+    fill_values.update(dict.fromkeys(categorical_cols, 'None'))
+    df.fillna(_fill_float_columns(df, fill_values), inplace=True)
     return df
 
 def remove_duplicates(df):
@@ -35,6 +45,7 @@ def remove_duplicates(df):
     return df.drop_duplicates()
 
 def scale_numeric_features(df, columns=None):
+    from sklearn.preprocessing import MinMaxScaler
     df = df.copy()
     if columns is None:
         columns = df.select_dtypes(include=[np.number]).columns
@@ -42,13 +53,19 @@ def scale_numeric_features(df, columns=None):
     df[columns] = scaler.fit_transform(df[columns])
     return df
 
-def encode_categorical_features(df, columns=None):
+def encode_categorical_features(df, columns=None, sparse=False):
+    from sklearn.preprocessing import OneHotEncoder
     df = df.copy()
     if columns is None:
         columns = df.select_dtypes(include=[object]).columns
-    encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
+    encoder = OneHotEncoder(sparse_output=sparse, handle_unknown='ignore')
     encoded_data = encoder.fit_transform(df[columns])
-    encoded_df = pd.DataFrame(encoded_data, columns=encoder.get_feature_names_out(columns))
+    if sparse:
+        # Keep the one-hot block as SparseDtype columns (fill value 0) instead of n_rows x n_categories floats
+        encoded_df = pd.DataFrame.sparse.from_spmatrix(encoded_data, index=df.index,
+                                                       columns=encoder.get_feature_names_out(columns)).fillna(0)
+    else:
+        encoded_df = pd.DataFrame(encoded_data, columns=encoder.get_feature_names_out(columns))
     df = pd.concat([df.drop(columns, axis=1), encoded_df], axis=1)
     return df
 
@@ -68,18 +85,23 @@ def get_features(df):
     features.extend([col for col in df.columns if 'Neighborhood_' in col or 'MSSubClass_' in col or 'MSZoning_' in col])
     return features
 
-def preprocess_test_data(df, features):
+def preprocess_test_data(df, features, preprocessor=None):
     """
     Preprocess test data to match training features.
     
     Args:
         df (pd.DataFrame): Raw test DataFrame.
         features (list): Training feature names.
+        preprocessor (HousePricePreprocessor): Optional preprocessor fitted on training data.
+            When given, test data is only transformed with the training statistics (no refitting).
         
     Returns:
         pd.DataFrame: Preprocessed test data.
     """
-    df = df.copy()
+    if preprocessor is not None:
+        if preprocessor.sparse:
+            return preprocessor.transform(df)
+        return preprocessor.transform(df).reindex(columns=features, fill_value=0.0)
     df = fill_missing_values(df)
     df = scale_numeric_features(df, ['LotFrontage', 'LotArea', 'OverallQual'])
     df = encode_categorical_features(df, ['MSSubClass', 'MSZoning', 'Neighborhood'])
@@ -92,11 +114,121 @@ def preprocess_test_data(df, features):
             test_data[col] = 0  # Fill missing features with 0
     return test_data
 
-def train_model(df):
-    features = get_features(df)
-    X = df[features]
+NUMERIC_FEATURES = ['LotFrontage', 'LotArea', 'OverallQual']
+CATEGORICAL_FEATURES = ['MSSubClass', 'MSZoning', 'Neighborhood']
+
+class HousePricePreprocessor:
+    """
+    Preprocessing fitted once on training data and reused for every prediction batch.
+    
+    Covers the same steps as fill_missing_values, scale_numeric_features, encode_categorical_features
+    and the LotArea_squared feature from get_features, but keeps the medians, scaler and encoder learned
+    at fit time so transform never refits on incoming data.
+    """
+    def __init__(self, numeric_columns=None, categorical_columns=None, sparse=False):
+        self.numeric_columns = list(numeric_columns or NUMERIC_FEATURES)
+        self.categorical_columns = list(categorical_columns or CATEGORICAL_FEATURES)
+        self.sparse = sparse
+        if 'LotArea' not in self.numeric_columns:
+            raise ValueError("numeric_columns must include 'LotArea' (used for LotArea_squared).")
+
+    def _categorical_inputs(self, df):
+        # Strings throughout, so numeric-coded MSSubClass mixes with 'None' and category columns
+        # (e.g., from read_df(optimize=True)) need no new category
+        cats = df[self.categorical_columns]
+        return cats.astype(str).where(cats.notna(), 'None')
+
+    def fit(self, df):
+        """
+        Learn fill values, scaling ranges and category vocabularies from training data.
+        
+        Args:
+            df (pd.DataFrame): Raw training DataFrame.
+        
+        Returns:
+            self: Fitted preprocessor.
+        """
+        from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
+        self.medians_ = df[self.numeric_columns].median()
+        numeric = df[self.numeric_columns].fillna(self.medians_)
+        self.scaler_ = MinMaxScaler().fit(numeric)
+        self.encoder_ = OneHotEncoder(sparse_output=self.sparse, handle_unknown='ignore')
+        self.encoder_.fit(self._categorical_inputs(df))
+        self.encoded_columns_ = list(self.encoder_.get_feature_names_out(self.categorical_columns))
+        self.features_ = self.numeric_columns + ['LotArea_squared'] + self.encoded_columns_
+        return self
+
+    def transform(self, df):
+        """
+        Apply the fitted preprocessing to a DataFrame.
+        
+        Args:
+            df (pd.DataFrame): Raw DataFrame with the numeric and categorical input columns.
+        
+        Returns:
+            pd.DataFrame: Feature matrix with columns in self.features_ order
+            (a scipy.sparse CSR matrix in the same column order when sparse=True).
+        """
+        if not hasattr(self, 'features_'):
+            raise ValueError('HousePricePreprocessor must be fitted before transform.')
+        numeric = self.scaler_.transform(df[self.numeric_columns].fillna(self.medians_))
+        encoded = self.encoder_.transform(self._categorical_inputs(df))
+        lot_area = numeric[:, [self.numeric_columns.index('LotArea')]]
+        if self.sparse:
+            import scipy.sparse as sp
+            return sp.hstack([sp.csr_matrix(numeric), sp.csr_matrix(lot_area ** 2), encoded], format='csr')
+        values = np.hstack([numeric, lot_area ** 2, encoded])
+        return pd.DataFrame(values, columns=self.features_, index=df.index)
+
+    def fit_transform(self, df):
+        return self.fit(df).transform(df)
+
+def save_preprocessor(preprocessor, path):
+    import joblib
+    joblib.dump(preprocessor, path)
+    print(f'Preprocessor saved to {path}')
+
+def load_preprocessor(path):
+    import joblib
+    return joblib.load(path)
+
+def to_sparse_matrix(df):
+    """
+    Convert a feature frame with dense and SparseDtype columns to a CSR matrix without densifying.
+    
+    Args:
+        df (pd.DataFrame): Feature DataFrame.
+        
+    Returns:
+        scipy.sparse.csr_matrix: Matrix with the same column order as df.
+    """
+    import scipy.sparse as sp
+    is_sparse = np.array([isinstance(dtype, pd.SparseDtype) for dtype in df.dtypes])
+    dense_cols = df.columns[~is_sparse]
+    sparse_cols = df.columns[is_sparse]
+    blocks = [sp.csr_matrix(df[dense_cols].to_numpy(dtype=float))]
+    if len(sparse_cols):
+        blocks.append(df[sparse_cols].sparse.to_coo().tocsr())
+    X = sp.hstack(blocks, format='csc')
+    order = np.argsort(np.r_[np.flatnonzero(~is_sparse), np.flatnonzero(is_sparse)])
+    return X[:, order].tocsr()
+
+def train_model(df, preprocessor=None, sparse=False):
+    from sklearn.linear_model import LinearRegression
+    from sklearn.model_selection import train_test_split
+    from sklearn.metrics import mean_squared_error, r2_score
     y = df['SalePrice']
-    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=7)
+    if preprocessor is not None:
+        # Raw data: split first and fit the preprocessor on the training rows only, so the
+        # hold-out metrics are not computed with statistics learned from the hold-out
+        train_df, test_df, y_train, y_test = train_test_split(df, y, test_size=0.2, random_state=7)
+        preprocessor.fit(train_df)
+        X_train = preprocessor.transform(train_df)
+        X_test = preprocessor.transform(test_df)
+    else:
+        features = get_features(df)
+        X = to_sparse_matrix(df[features]) if sparse else df[features]
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=7)
     model = LinearRegression()
     model.fit(X_train, y_train)
     y_pred = model.predict(X_test)
@@ -107,5 +239,6 @@ def train_model(df):
     return model
 
 def save_model(model, path):
+    import joblib
     joblib.dump(model, path)
     print(f'Model saved to {path}')
\ No newline at end of file
@@ -0,0 +1,59 @@
+"""
+Production entry point for the Flask model service in app.py.
+
+Runs the app under gunicorn with several worker processes instead of the single-process Flask
+dev server. The app, including linear_model.pkl, is loaded once in the parent process
+(preload_app) and the forked workers share those pages copy-on-write.
+
+Usage: python serve.py --workers 4 --threads 2 --bind 0.0.0.0:5001
+Environment (overridden by flags): SERVE_WORKERS, SERVE_THREADS, SERVE_BIND, SERVE_TIMEOUT.
+"""
+
+import argparse
+import gc
+import multiprocessing
+import os
+
+from gunicorn.app.base import BaseApplication
+
+class ModelServer(BaseApplication):
+    """
+    gunicorn application that preloads app.py in the parent before forking workers.
+    """
+    def __init__(self, options):
+        self.options = options
+        super().__init__()
+
+    def load_config(self):
+        for key, value in self.options.items():
+            self.cfg.set(key, value)
+
+    def load(self):
+        from app import app
+        # Move everything allocated so far (model, Flask app) out of the GC's reach so
+        # collections in the workers do not touch, and copy, the shared pages
+        gc.freeze()
+        return app
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the housing price model with gunicorn')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('SERVE_WORKERS', multiprocessing.cpu_count())),
+                        help='Worker processes (default: number of CPU cores)')
+    parser.add_argument('--threads', type=int, default=int(os.getenv('SERVE_THREADS', 1)),
+                        help='Threads per worker (default: 1)')
+    parser.add_argument('--bind', default=os.getenv('SERVE_BIND', '127.0.0.1:5001'),
+                        help='Address to listen on (default: 127.0.0.1:5001)')
+    parser.add_argument('--timeout', type=int, default=int(os.getenv('SERVE_TIMEOUT', 30)),
+                        help='Worker timeout in seconds (default: 30)')
+    args = parser.parse_args(argv)
+    options = {
+        'bind': args.bind,
+        'workers': args.workers,
+        'threads': args.threads,
+        'timeout': args.timeout,
+        'preload_app': True,
+    }
+    ModelServer(options).run()
+
+if __name__ == '__main__':
+    main()
@@ -1,50 +1,147 @@
 import pandas as pd
+import numpy as np
+import operator
 import os
+import shutil
+import uuid
 
-def write_df(df, filename, data_dir):
+CSV_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', '.csv.bz2', '.csv.xz')
+
+def _replace_path(tmp_path, filepath):
+    """Move a finished temp file or dataset directory onto filepath, whatever kind of path it replaces."""
+    if os.path.isdir(filepath) or (os.path.isdir(tmp_path) and os.path.exists(filepath)):
+        # A directory cannot replace (or be replaced by) anything in one rename: move the old one aside first
+        old_path = f"{tmp_path}.old"
+        os.replace(filepath, old_path)
+        os.replace(tmp_path, filepath)
+        if os.path.isdir(old_path):
+            shutil.rmtree(old_path)
+        else:
+            os.remove(old_path)
+    else:
+        os.replace(tmp_path, filepath)
+
+def write_df(df, filename, data_dir, compression='infer', partition_cols=None, atomic=True):
     """
     Write a DataFrame to a file (CSV or Parquet) in the specified directory.
     
     Args:
         df (pd.DataFrame): DataFrame to save.
-        filename (str): Name of the file (e.g., 'sample.csv' or 'sample.parquet').
+        filename (str): Name of the file (e.g., 'sample.csv', 'sample.csv.gz' or 'sample.parquet').
         data_dir (str): Directory path to save the file.
+        compression (str): Codec; for CSV 'gzip' or 'zstd' (default 'infer': from the suffix, e.g. .csv.gz;
+            zstd needs the zstandard package), for Parquet 'snappy' (default 'infer' means snappy), 'zstd' or
+            'gzip'. None writes uncompressed output.
+        partition_cols (list): Parquet only; write a dataset directory split by these columns
+            (e.g., ['Neighborhood'] or ['YrSold']) so readers can load only the partitions they need.
+        atomic (bool): Write to a temporary path in data_dir and rename it into place, so a crashed
+            job never leaves a half-written file (default: True).
         
     Returns:
         str: Path to the saved file.
         
     Raises:
-        ValueError: If file suffix is not .csv or .parquet.
+        ValueError: If file suffix is not .csv (optionally compressed) or .parquet, or partition_cols is used with CSV.
         ImportError: If Parquet engine (pyarrow) is missing for .parquet files.
     """
     os.makedirs(data_dir, exist_ok=True)  # Create directory if it doesn't exist
     filepath = os.path.join(data_dir, filename)
+    # Same directory (same filesystem, so the rename is atomic) and same suffix (so compression is inferred)
+    target = os.path.join(data_dir, f".tmp-{uuid.uuid4().hex[:8]}-{filename}") if atomic else filepath
     
-    if filename.endswith('.csv'):
-        df.to_csv(filepath, index=False)
-    elif filename.endswith('.parquet'):
-        try:
-            df.to_parquet(filepath, index=False, engine='pyarrow')
-        except ImportError:
-            raise ImportError("Missing 'pyarrow' library. Install it to save Parquet files.")
-    else:
-        raise ValueError("Filename must end with .csv or .parquet")
+    try:
+        if filename.endswith(CSV_SUFFIXES):
+            if partition_cols:
+                raise ValueError("partition_cols is only supported for .parquet files")
+            df.to_csv(target, index=False, compression=compression)
+        elif filename.endswith('.parquet'):
+            try:
+                df.to_parquet(target, index=False, engine='pyarrow', compression='snappy' if compression == 'infer' else compression,
+                              partition_cols=partition_cols)
+            except ImportError:
+                raise ImportError("Missing 'pyarrow' library. Install it to save Parquet files.")
+        else:
+            raise ValueError("Filename must end with .csv or .parquet")
+        if atomic:
+            _replace_path(target, filepath)
+    finally:
+        if atomic and os.path.isdir(target):
+            shutil.rmtree(target)
+        elif atomic and os.path.exists(target):
+            os.remove(target)
     
     return filepath
 
-def read_df(filename, data_dir):
+def optimize_dtypes(df, max_unique_ratio=0.05, max_categories=1000, verbose=True):
+    """
+    Downcast numeric columns to the narrowest safe dtype and convert low-cardinality string columns to category.
+    
+    Args:
+        df (pd.DataFrame): DataFrame to optimize.
+        max_unique_ratio (float): String columns with at most this share of unique values become category (default: 0.05).
+        max_categories (int): Never convert columns with more unique values than this (default: 1000).
+        verbose (bool): Print memory usage before and after (default: True).
+        
+    Returns:
+        pd.DataFrame: DataFrame with optimized dtypes.
+    """
+    before = df.memory_usage(deep=True).sum()
+    # Shallow copy: converted columns are assigned as new arrays, so the caller's frame is untouched
+    # without duplicating all of its data first
+    df = df.copy(deep=False)
+    for col in df.select_dtypes(include=['integer']).columns:
+        df[col] = pd.to_numeric(df[col], downcast='integer')
+    for col in df.select_dtypes(include=['floating']).columns:
+        # Only downcast floats that survive the float32 round trip unchanged
+        downcast = df[col].astype(np.float32)
+        if np.array_equal(downcast.to_numpy(dtype=np.float64), df[col].to_numpy(), equal_nan=True):
+            df[col] = downcast
+    for col in df.select_dtypes(include=['object', 'string']).columns:
+        if df[col].nunique(dropna=True) <= min(max_unique_ratio * len(df), max_categories):
+            df[col] = df[col].astype('category')
+    if verbose:
+        after = df.memory_usage(deep=True).sum()
+        print(f'Memory usage: {before / 1e6:.2f} MB -> {after / 1e6:.2f} MB '
+              f'(saved {(before - after) / 1e6:.2f} MB, {before / max(after, 1):.1f}x smaller)')
+    return df
+
+FILTER_OPS = {
+    '==': operator.eq, '!=': operator.ne, '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    'in': lambda col, values: col.isin(values), 'not in': lambda col, values: ~col.isin(values),
+}
+
+def _filter_mask(df, filters):
+    """Boolean mask for rows matching all (column, op, value) filters."""
+    mask = pd.Series(True, index=df.index)
+    for col, op, value in filters:
+        if op not in FILTER_OPS:
+            raise ValueError(f"Filter operator must be one of {', '.join(FILTER_OPS)}")
+        mask &= FILTER_OPS[op](df[col], value)
+    return mask
+
+def read_df(filename, data_dir, optimize=False, columns=None, filters=None, chunksize=100_000):
     """
     Read a DataFrame from a file (CSV or Parquet) in the specified directory.
+
+    columns and filters are pushed down to the reader: CSV files parse only the needed columns
+    (usecols) and are filtered chunk by chunk, Parquet files and partitioned Parquet datasets read only
+    the needed columns and skip row groups/partitions that cannot match.
     
     Args:
         filename (str): Name of the file (e.g., 'sample.csv' or 'sample.parquet').
         data_dir (str): Directory path containing the file.
+        optimize (bool): Downcast numerics and convert low-cardinality strings to category,
+            printing the memory saved (default: False).
+        columns (list): Columns to load, e.g. the features train_model uses (default: all).
+        filters (list): Row filters as (column, op, value) tuples that must all hold, with op in
+            ==, !=, <, <=, >, >=, in, not in (e.g., [('YrSold', '>=', 2008), ('MSZoning', 'in', ['RL', 'RM'])]).
+        chunksize (int): Rows per chunk when filtering a CSV file.
         
     Returns:
         pd.DataFrame: Loaded DataFrame.
         
     Raises:
-        ValueError: If file suffix is not .csv or .parquet.
+        ValueError: If file suffix is not .csv or .parquet, or a filter operator is unknown.
         ImportError: If Parquet engine (pyarrow) is missing for .parquet files.
         FileNotFoundError: If the file does not exist.
     """
@@ -52,12 +149,24 @@ def read_df(filename, data_dir):
     if not os.path.exists(filepath):
         raise FileNotFoundError(f"File not found: {filepath}")
     
-    if filename.endswith('.csv'):
-        return pd.read_csv(filepath)
+    if filename.endswith(CSV_SUFFIXES):
+        usecols = None
+        if columns is not None:
+            # Filter columns are parsed too, then dropped after filtering
+            usecols = list(columns) + [col for col, _, _ in filters or [] if col not in columns]
+        if filters:
+            chunks = pd.read_csv(filepath, usecols=usecols, chunksize=chunksize)
+            df = pd.concat([chunk[_filter_mask(chunk, filters)] for chunk in chunks], ignore_index=True)
+        else:
+            df = pd.read_csv(filepath, usecols=usecols)
+        if columns is not None:
+            df = df[list(columns)]
     elif filename.endswith('.parquet'):
         try:
-            return pd.read_parquet(filepath, engine='pyarrow')
+            df = pd.read_parquet(filepath, engine='pyarrow', columns=columns, filters=filters or None)
         except ImportError:
             raise ImportError("Missing 'pyarrow' library. Install it to read Parquet files.")
     else:
-        raise ValueError("Filename must end with .csv or .parquet")
\ No newline at end of file
+        raise ValueError("Filename must end with .csv or .parquet")
+    
+    return optimize_dtypes(df) if optimize else df
@@ -1,12 +1,20 @@
+import bisect
+from collections import deque
+
 import pandas as pd
 import numpy as np
 
-def detect_outliers_iqr(series: pd.Series, k: float = 1.5) -> pd.Series:
+def detect_outliers_iqr(series: pd.Series, k: float = 1.5, sketch=None) -> pd.Series:
     """Return boolean mask for IQR-based outliers.
     Assumptions: distribution reasonably summarized by quartiles; k controls strictness.
+    sketch: optional approximate-quantile sketch fed chunk by chunk (any object with quantile(q),
+    e.g. QuantileSketch from project/src/sketches.py); its quartiles replace sorting series.
     """
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
+    if sketch is not None:
+        q1, q3 = sketch.quantile(0.25), sketch.quantile(0.75)
+    else:
+        q1 = series.quantile(0.25)
+        q3 = series.quantile(0.75)
     iqr = q3 - q1
     lower = q1 - k * iqr
     upper = q3 + k * iqr
@@ -21,7 +29,125 @@ def detect_outliers_zscore(series: pd.Series, threshold: float = 3.0) -> pd.Seri
     z = (series - mu) / (sigma if sigma != 0 else 1.0)
     return z.abs() > threshold
 
-def winsorize_series(series: pd.Series, lower: float = 0.05, upper: float = 0.95) -> pd.Series:
-    lo = series.quantile(lower)
-    hi = series.quantile(upper)
+def winsorize_series(series: pd.Series, lower: float = 0.05, upper: float = 0.95, sketch=None) -> pd.Series:
+    quantiles = sketch if sketch is not None else series
+    lo = quantiles.quantile(lower)
+    hi = quantiles.quantile(upper)
     return series.clip(lower=lo, upper=hi)
+
+def _prior_stat(series: pd.Series, by, stat) -> pd.Series:
+    """Apply a rolling/ewm statistic per group and shift it one bar, so each value is compared
+    with the bars before it only (an outlier does not inflate its own baseline)."""
+    keys = by if by is not None else np.zeros(len(series), dtype=int)
+    return series.groupby(keys, sort=False).transform(lambda s: stat(s).shift())
+
+def rolling_zscore_outliers(series: pd.Series, window: int = 20, threshold: float = 3.0, by=None) -> pd.Series:
+    """Return boolean mask where |x - rolling mean| / rolling std > threshold over the previous window bars.
+    Assumptions: series is time-ordered within each group (by, e.g. df['symbol']); pandas rolling
+    mean/std update the window sums incrementally, so this is O(n). The first window bars are not flagged.
+    """
+    mu = _prior_stat(series, by, lambda s: s.rolling(window).mean())
+    sigma = _prior_stat(series, by, lambda s: s.rolling(window).std(ddof=0))
+    z = (series - mu) / sigma.where(sigma != 0, 1.0)
+    return z.abs() > threshold
+
+def rolling_iqr_outliers(series: pd.Series, window: int = 20, k: float = 1.5, by=None) -> pd.Series:
+    """Return boolean mask for values outside [Q1 - k*IQR, Q3 + k*IQR] of the previous window bars.
+    Assumptions: as rolling_zscore_outliers; rolling quantiles keep a sorted window that is updated
+    per bar (O(log window)) instead of re-sorting every window.
+    """
+    q1 = _prior_stat(series, by, lambda s: s.rolling(window).quantile(0.25))
+    q3 = _prior_stat(series, by, lambda s: s.rolling(window).quantile(0.75))
+    iqr = q3 - q1
+    return (series < q1 - k * iqr) | (series > q3 + k * iqr)
+
+def ewma_outliers(series: pd.Series, span: int = 20, threshold: float = 3.0, by=None) -> pd.Series:
+    """Return boolean mask where |x - EWMA| / EW std > threshold, using the bars before x.
+    Assumptions: recent bars matter more than old ones (alpha = 2 / (span + 1)); O(n) recursion.
+    The first span bars of each group are not flagged.
+    """
+    mu = _prior_stat(series, by, lambda s: s.ewm(span=span, adjust=False, min_periods=span).mean())
+    var = _prior_stat(series, by, lambda s: s.ewm(span=span, adjust=False, min_periods=span).var(bias=True))
+    sigma = np.sqrt(var)
+    z = (series - mu) / sigma.where(sigma != 0, 1.0)
+    return z.abs() > threshold
+
+ROLLING_METHODS = {'zscore': rolling_zscore_outliers, 'iqr': rolling_iqr_outliers, 'ewma': ewma_outliers}
+
+class RollingOutlierDetector:
+    """Incremental version of the rolling detectors for bars that arrive over time.
+
+    Keeps O(window) state per symbol (last window values with running sums, or EWMA mean/variance),
+    so each new bar costs O(1) for 'zscore'/'ewma' and O(window) for 'iqr', and no history is re-read.
+    Flags match rolling_zscore_outliers / rolling_iqr_outliers / ewma_outliers on the same bars.
+
+    Example:
+        detector = RollingOutlierDetector(method='zscore', window=20)
+        flags = detector.update(new_bars, value_col='close', by='symbol')
+    """
+    def __init__(self, method: str = 'zscore', window: int = 20, threshold: float = 3.0, k: float = 1.5):
+        if method not in ROLLING_METHODS:
+            raise ValueError(f"Method must be one of {', '.join(ROLLING_METHODS)}.")
+        self.method = method
+        self.window = window
+        self.threshold = threshold
+        self.k = k
+        self.alpha = 2 / (window + 1)
+        self.state = {}
+
+    def _quantile(self, values, q):
+        # Linear interpolation, as pandas rolling quantile
+        pos = q * (len(values) - 1)
+        lo = int(pos)
+        hi = min(lo + 1, len(values) - 1)
+        return values[lo] + (values[hi] - values[lo]) * (pos - lo)
+
+    def _score(self, state, x):
+        """Flag x against the current state, then add x to it."""
+        if self.method == 'ewma':
+            flag = False
+            if state['n'] >= self.window:
+                sigma = np.sqrt(state['var'])
+                flag = abs(x - state['mean']) / (sigma if sigma != 0 else 1.0) > self.threshold
+            if state['n'] == 0:
+                state['mean'] = x
+            else:
+                diff = x - state['mean']
+                incr = self.alpha * diff
+                state['mean'] += incr
+                state['var'] = (1 - self.alpha) * (state['var'] + diff * incr)
+            state['n'] += 1
+            return flag
+
+        window = state['values']
+        flag = False
+        if len(window) == self.window:
+            if self.method == 'zscore':
+                mu = state['sum'] / self.window
+                sigma = np.sqrt(max(state['sumsq'] / self.window - mu ** 2, 0.0))
+                flag = abs(x - mu) / (sigma if sigma != 0 else 1.0) > self.threshold
+            else:
+                q1, q3 = self._quantile(state['sorted'], 0.25), self._quantile(state['sorted'], 0.75)
+                flag = x < q1 - self.k * (q3 - q1) or x > q3 + self.k * (q3 - q1)
+            old = window.popleft()
+            state['sum'] -= old
+            state['sumsq'] -= old * old
+            if self.method == 'iqr':
+                del state['sorted'][bisect.bisect_left(state['sorted'], old)]
+        window.append(x)
+        state['sum'] += x
+        state['sumsq'] += x * x
+        if self.method == 'iqr':
+            bisect.insort(state['sorted'], x)
+        return flag
+
+    def update(self, df: pd.DataFrame, value_col: str = 'close', by: str = None) -> pd.Series:
+        """Score new bars (in time order within each symbol, no missing values) and return their boolean outlier mask."""
+        symbols = df[by].to_numpy() if by is not None else [None] * len(df)
+        flags = []
+        for symbol, x in zip(symbols, df[value_col].to_numpy(dtype=float)):
+            if symbol not in self.state:
+                self.state[symbol] = ({'n': 0, 'mean': 0.0, 'var': 0.0} if self.method == 'ewma' else
+                                      {'values': deque(), 'sum': 0.0, 'sumsq': 0.0, 'sorted': []})
+            flags.append(bool(self._score(self.state[symbol], x)))
+        return pd.Series(flags, index=df.index, name=f'{value_col}_outlier')
@@ -7,7 +7,9 @@ Functions:
 - clean_column_names(df): Standardizes DataFrame column names by converting to lowercase and replacing spaces/special characters with underscores.
   Future Use: Applied during data preprocessing to normalize column names across datasets like Kaggle train/test.csv.
 
-- convert_year_to_age(df, year_columns, current_year): Converts year columns (e.g., YearBuilt) to age relative to current_year.
+- convert_year_to_age(df, year_columns, current_year=2025, inplace=False, dtype='int16'): Converts year columns (e.g., YearBuilt)
+  to compact integer ages relative to current_year, which may be a per-row sale year (e.g., YrSold).
+  Defined in src/features.py and re-exported here.
   Future Use: Creates age-based features for modeling, capturing temporal effects in housing data.
 
 - save_data(df, filename, data_dir): Saves DataFrame to CSV in the specified directory, creating folders if needed.
@@ -16,6 +18,11 @@ Functions:
 
 import pandas as pd
 import os
+import sys
+
+# Project root on sys.path (as in the notebooks) so src.features is importable from notebooks/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.features import AGE_COLUMN_NAMES, convert_year_to_age
 
 def clean_column_names(df):
     """
@@ -31,29 +38,6 @@ def clean_column_names(df):
     df.columns = df.columns.str.lower().str.replace(r'[^a-z0-9]', '_', regex=True)
     return df
 
-def convert_year_to_age(df, year_columns, current_year=2025):
-    """
-    Convert year columns to age relative to current_year.
-    
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-        year_columns (list): List of year column names (e.g., ['yearbuilt', 'yearremodadd']).
-        current_year (int): Reference year for age calculation (default: 2025).
-        
-    Returns:
-        pd.DataFrame: DataFrame with new age columns (e.g., house_age, remodel_age).
-        
-    Raises:
-        KeyError: If specified columns are not in DataFrame.
-    """
-    df = df.copy()
-    for col in year_columns:
-        if col not in df.columns:
-            raise KeyError(f"Column {col} not found in DataFrame")
-        age_col = "house_age" if col == "yearbuilt" else "remodel_age"
-        df[age_col] = current_year - df[col]
-    return df
-
 def save_data(df, filename, data_dir):
     """
     Save DataFrame to CSV in the specified directory, creating folders if needed.
@@ -0,0 +1,215 @@
+"""
+On-disk cache for cleaned datasets, so unchanged inputs are never re-cleaned.
+
+Classes:
+- CleaningCache(cache_dir, max_bytes=1GB): Stores the output of a sequence of cleaning steps as a Parquet artifact.
+  Key: content hash of the input file + each step's name, parameters and the source of its defining module and
+  the modules of the same package it uses, plus the numpy/pandas/pyarrow/scikit-learn versions, so editing a
+  cleaning function or a helper it calls, changing a parameter or upgrading a library invalidates its entries.
+  Eviction: least recently used artifacts are deleted once the cache grows past max_bytes.
+
+Functions:
+- file_digest(path): SHA-256 of a file's content, read in blocks (memoized per path/size/mtime).
+"""
+
+import hashlib
+import inspect
+import json
+import os
+import pickle
+import uuid
+
+import pandas as pd
+
+CACHE_VERSION = 1  # Bump to invalidate every entry when the artifact layout changes
+
+_digest_memo = {}
+
+def file_digest(path, block_size=1 << 20):
+    """
+    SHA-256 of a file's content.
+
+    Args:
+        path (str): File to hash.
+        block_size (int): Bytes read per block.
+
+    Returns:
+        str: Hex digest; reused for the same path while its size and mtime do not change.
+    """
+    stat = os.stat(path)
+    memo_key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if memo_key not in _digest_memo:
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+        _digest_memo[memo_key] = digest.hexdigest()
+    return _digest_memo[memo_key]
+
+def _param_token(value):
+    # Fitted scalers/encoders and other objects are keyed by their pickled state
+    return hashlib.sha256(pickle.dumps(value)).hexdigest()
+
+_LIBRARIES = ('numpy', 'pandas', 'pyarrow', 'scikit-learn')
+
+def _library_versions():
+    # Library upgrades can change cleaning output (e.g., quantile or encoder behavior), so they are part of the key
+    from importlib import metadata
+    versions = {}
+    for name in _LIBRARIES:
+        try:
+            versions[name] = metadata.version(name)
+        except metadata.PackageNotFoundError:
+            versions[name] = None
+    return versions
+
+def _package_modules(module):
+    """module plus the modules of its own package it uses (e.g., src.cleaning -> src.cache, src.sketches), transitively."""
+    package = (module.__package__ or module.__name__).split('.')[0]
+    seen = {module.__name__: module}
+    stack = [module]
+    while stack:
+        for value in list(vars(stack.pop()).values()):
+            dependency = value if inspect.ismodule(value) else inspect.getmodule(value)
+            name = getattr(dependency, '__name__', '')
+            if dependency is not None and name.split('.')[0] == package and name not in seen:
+                seen[name] = dependency
+                stack.append(dependency)
+    return [seen[name] for name in sorted(seen)]
+
+def _code_token(func):
+    # Hash the defining module and the package modules it uses, so edits to helpers the step calls
+    # (e.g., _add_fill_categories in src/cleaning.py, QuantileSketch in src/sketches.py) also invalidate its entries
+    module = inspect.getmodule(func)
+    digest = hashlib.sha256()
+    try:
+        for dependency in _package_modules(module) if module is not None else [func]:
+            digest.update(inspect.getsource(dependency).encode())
+    except (OSError, TypeError):
+        try:
+            return hashlib.sha256(inspect.getsource(func).encode()).hexdigest()
+        except (OSError, TypeError):
+            return getattr(func, '__qualname__', repr(func))
+    return digest.hexdigest()
+
+def _step_signature(step):
+    func, params = step if isinstance(step, tuple) else (step, {})
+    return func, params, {
+        'name': f'{func.__module__}.{func.__qualname__}',
+        'code': _code_token(func),
+        'params': json.dumps(params, sort_keys=True, default=_param_token),
+    }
+
+class CleaningCache:
+    """
+    Size-bounded LRU cache of cleaned DataFrames stored as Parquet files in cache_dir.
+
+    Example:
+        cache = CleaningCache('data/cache')
+        df = cache.run('data/raw/train.csv', [fill_missing, (encode_categorical, {'columns': ['MSZoning']})])
+    """
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def key(self, input_path, steps):
+        """
+        Cache key for running steps on input_path.
+
+        Args:
+            input_path (str): CSV or Parquet input file.
+            steps (list): Cleaning functions, or (function, params) tuples, applied in order.
+
+        Returns:
+            str: Hex key.
+        """
+        payload = {
+            'version': CACHE_VERSION,
+            'input': file_digest(input_path),
+            'libraries': _library_versions(),
+            'steps': [_step_signature(step)[2] for step in steps],
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f'{key}.parquet')
+
+    def get(self, key):
+        """Return the cached DataFrame for key, or None on a miss."""
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        os.utime(path)  # Mark as recently used
+        return pd.read_parquet(path)
+
+    def put(self, key, df):
+        """Store df under key (atomically) and evict least recently used artifacts over max_bytes."""
+        # Parquet has no sparse type: sparse one-hot columns are stored dense
+        sparse_cols = [col for col in df.columns if isinstance(df[col].dtype, pd.SparseDtype)]
+        if sparse_cols:
+            df = df.astype({col: df[col].dtype.subtype for col in sparse_cols})
+        path = self._path(key)
+        tmp_path = os.path.join(self.cache_dir, f'.tmp-{uuid.uuid4().hex[:8]}.parquet')
+        try:
+            df.to_parquet(tmp_path)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep=None):
+        """
+        Delete least recently used artifacts until the cache fits in max_bytes.
+
+        Args:
+            keep (str): Artifact path never evicted (the one just written).
+
+        Returns:
+            int: Number of artifacts deleted.
+        """
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if name.endswith('.parquet') and not name.startswith('.tmp-'):
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                entries.append((stat.st_mtime, stat.st_size, os.path.join(self.cache_dir, name)))
+        total = sum(size for _, size, _ in entries)
+        deleted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            if path == keep:
+                continue
+            os.remove(path)
+            total -= size
+            deleted += 1
+        return deleted
+
+    def run(self, input_path, steps):
+        """
+        Return steps applied to the data in input_path, from the cache when possible.
+
+        Args:
+            input_path (str): CSV or Parquet input file.
+            steps (list): Cleaning functions (e.g., fill_missing, drop_duplicates), or (function, params)
+                tuples, applied in order; each must take and return a DataFrame.
+
+        Returns:
+            pd.DataFrame: Cleaned data as stored in the cache (identical on hits and misses; sparse columns are dense).
+        """
+        key = self.key(input_path, steps)
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+        if input_path.endswith('.parquet'):
+            df = pd.read_parquet(input_path)
+        else:
+            df = pd.read_csv(input_path)
+        for step in steps:
+            func, params = step if isinstance(step, tuple) else (step, {})
+            df = func(df, **params)
+        path = self.put(key, df)
+        # Return the stored artifact so a miss gives exactly what later hits will (e.g., dense one-hot columns)
+        return pd.read_parquet(path)
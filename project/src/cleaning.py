@@ -4,56 +4,154 @@ Reusable data cleaning/preprocessing functions for the Housing Price Prediction
 These functions are designed for the Kaggle House Prices dataset but can be adapted for similar datasets.
 
 Functions:
-- fill_missing(df, numeric_strategy='median', categorical_strategy='None'): Handles missing values in numeric and categorical columns.
+- fill_missing(df, numeric_strategy='median', categorical_strategy='None', inplace=False, fill_values=None, sketches=None): Handles missing values in numeric and categorical columns.
   Assumptions: Numeric missing values are suitable for median imputation due to skewness; categorical missing values represent 'None' (e.g., no basement).
   Rationale: Median reduces outlier bias; 'None' aligns with data_description.txt.
 
 - drop_duplicates(df): Removes duplicate rows.
   Assumptions: Duplicates are errors and can be safely removed without significant data loss.
 
-- normalize_data(df, columns=None): Applies Min-Max normalization to numeric columns.
+- normalize_data(df, columns=None, scaler=None): Applies Min-Max normalization to numeric columns.
   Assumptions: Normalization is appropriate for model compatibility; no extreme outliers after cleaning.
+  Pass a scaler fitted on training data to transform new data without refitting.
 
-- encode_categorical(df, columns=None): One-hot encodes categorical columns.
+- encode_categorical(df, columns=None, encoder=None, sparse=False): One-hot encodes categorical columns.
   Assumptions: Categorical features are nominal; one-hot encoding is suitable for models like linear regression.
+  Pass an encoder fitted on training data to transform new data without refitting.
+  sparse=True keeps the encoded block as pandas sparse columns for high-cardinality features.
+
+- compute_chunk_stats(input_path, chunksize=100000): First pass over a CSV in chunks to collect global statistics.
+  Assumptions: Approximate medians (QuantileSketch) are acceptable for imputation on files larger than RAM.
+
+- clean_csv_in_chunks(input_path, output_path, chunksize=100000, ...): Two-pass streaming version of
+  fill_missing/normalize_data/encode_categorical that writes CSV or Parquet output incrementally.
+  Rationale: Memory is bounded by the chunk size, not the file size.
+
+- cached_clean(input_path, steps=None, cache_dir='data/cache', max_bytes=1GB): Runs cleaning steps on a file through
+  CleaningCache (src/cache.py), returning the stored Parquet artifact when input content, parameters and code are unchanged.
 """
 
+import os
 import pandas as pd
 import numpy as np
+import scipy.sparse as sp
 from sklearn.preprocessing import MinMaxScaler, OneHotEncoder
 
-def fill_missing(df, numeric_strategy='median', categorical_strategy='None'):
+from .cache import CleaningCache
+from .sketches import QuantileSketch
+
+def _add_fill_categories(df, fill_values):
+    """Add fill values to the categories of category columns (e.g., from read_df(optimize=True)) so fillna accepts them."""
+    for col in df.select_dtypes(include='category').columns:
+        if col in fill_values and fill_values[col] not in df[col].cat.categories:
+            df[col] = df[col].cat.add_categories([fill_values[col]])
+
+def _column_median(values, missing):
+    """Median of the non-missing values with one np.partition (the lower middle is the max of the left part)."""
+    present = values[~missing]
+    if not len(present):
+        return np.nan  # All-NaN column, as with DataFrame.median
+    half = len(present) // 2
+    part = np.partition(present, half)
+    return part[half] if len(present) % 2 else (part[half] + part[:half].max()) / 2
+
+def _fill_float_blocks(df, fill_values, median_cols=()):
+    """
+    Fill NaNs in float columns with one masked array assignment per dtype block.
+
+    Columns in median_cols are filled with their median, taken from the same block and NaN mask
+    (and only for columns that have NaNs), so the data is extracted once for both steps.
+    Returns the columns handled; the rest are left for fillna.
+    """
+    median_cols = set(median_cols)
+    # Non-numeric fill values (e.g., 'None' for a text column that is all-NaN in a chunk) are left to fillna
+    dtypes = {col: dtype for col, dtype in df.dtypes.items()
+              if isinstance(dtype, np.dtype) and dtype.kind == 'f'
+              and (col in median_cols or (col in fill_values and pd.api.types.is_number(fill_values[col])))}
+    for dtype in set(dtypes.values()):
+        cols = [col for col, col_dtype in dtypes.items() if col_dtype == dtype]
+        vals = df[cols].to_numpy(dtype=dtype, copy=True)
+        mask = np.isnan(vals)
+        has_nan = mask.any(axis=0)
+        if not has_nan.any():
+            continue
+        fill = np.array([np.nan if col in median_cols else fill_values[col] for col in cols], dtype=dtype)
+        for i in np.flatnonzero(has_nan & np.array([col in median_cols for col in cols])):
+            fill[i] = _column_median(vals[:, i], mask[:, i])
+        # Broadcast the per-column fill row under the mask (no index arrays built)
+        np.copyto(vals, fill, where=mask)
+        # loc writes into the existing float block; df[cols] = vals would rebuild the columns
+        df.loc[:, cols] = vals
+    return list(dtypes)
+
+def _fill_all(df, fill_values, median_cols=()):
+    """Fill float columns block-wise and the remaining (object, category, nullable) columns with one fillna."""
+    filled = set(_fill_float_blocks(df, fill_values, median_cols))
+    rest = {col: value for col, value in fill_values.items() if col not in filled}
+    if rest:
+        _add_fill_categories(df, rest)
+        df.fillna(rest, inplace=True)
+
+def fill_missing(df, numeric_strategy='median', categorical_strategy='None', inplace=False, fill_values=None,
+                 sketches=None):
     """
     Handle missing values in numeric and categorical columns.
     
+    Float columns are filled with one masked assignment over their NumPy block, with medians taken
+    from the same block; only the remaining columns (object/category, nullable) go through a
+    dict-based fillna, so there is no per-column loop over the numeric data.
+    
     Args:
         df (pd.DataFrame): Input DataFrame.
         numeric_strategy (str): Strategy for numeric columns ('mean', 'median').
         categorical_strategy (str): Strategy for categorical columns ('None', 'mode').
+        inplace (bool): Fill df itself instead of a copy (default: False).
+        fill_values (dict): Precomputed column -> fill value mapping (e.g., from compute_chunk_stats);
+            when given the strategies are ignored and no statistics are computed.
+        sketches (dict): Column -> QuantileSketch (see src.sketches.sketch_columns) built over streamed or
+            partitioned data; with numeric_strategy='median' their approximate medians replace the exact ones
+            (numeric columns without a sketch use the exact median of df).
         
     Returns:
         pd.DataFrame: DataFrame with missing values filled.
+        
+    Raises:
+        ValueError: If a strategy is not recognized.
     """
-    df = df.copy()
+    if not inplace:
+        df = df.copy()
+    if fill_values is not None:
+        _fill_all(df, fill_values)
+        return df
     numeric_cols = df.select_dtypes(include=[np.number]).columns
-    categorical_cols = df.select_dtypes(include=[object]).columns
+    categorical_cols = df.select_dtypes(include=[object, 'category']).columns
     
-    # Fill numeric
-    for col in numeric_cols:
-        if numeric_strategy == 'mean':
-            fill_value = df[col].mean()
-        elif numeric_strategy == 'median':
-            fill_value = df[col].median()
-        df[col].fillna(fill_value, inplace=True)
+    # Fill numeric; exact float medians are computed while filling (see _fill_float_blocks)
+    median_cols = []
+    if numeric_strategy == 'mean':
+        fill_values = df[numeric_cols].mean().to_dict()
+    elif numeric_strategy == 'median':
+        # Columns without a sketch use the exact median of df
+        exact = [col for col in numeric_cols if sketches is None or col not in sketches]
+        median_cols = [col for col in exact if isinstance(df[col].dtype, np.dtype) and df[col].dtype.kind == 'f']
+        fill_values = df[[col for col in exact if col not in median_cols]].median().to_dict()
+        if sketches is not None:
+            fill_values.update({col: sketches[col].median() for col in numeric_cols if col in sketches})
+    else:
+        raise ValueError("numeric_strategy must be 'mean' or 'median'.")
     
     # Fill categorical
-    for col in categorical_cols:
-        if categorical_strategy == 'None':
-            fill_value = 'None'
-        elif categorical_strategy == 'mode':
-            fill_value = df[col].mode()[0]
-        df[col].fillna(fill_value, inplace=True)
+    if categorical_strategy == 'None':
+        fill_values.update(dict.fromkeys(categorical_cols, 'None'))
+    elif categorical_strategy == 'mode':
+        modes = df[categorical_cols].mode()
+        # No categorical columns (or all of them empty) gives a frame without rows
+        if len(categorical_cols) and len(modes):
+            fill_values.update(modes.iloc[0].to_dict())
+    else:
+        raise ValueError("categorical_strategy must be 'None' or 'mode'.")
     
+    _fill_all(df, fill_values, median_cols)
     return df
 
 def drop_duplicates(df):
@@ -69,40 +167,220 @@ def drop_duplicates(df):
     df = df.copy()
     return df.drop_duplicates()
 
-def normalize_data(df, columns=None):
+def normalize_data(df, columns=None, scaler=None):
     """
     Apply Min-Max normalization to specified numeric columns.
     
     Args:
         df (pd.DataFrame): Input DataFrame.
-        columns (list): List of column names to normalize (default: all numeric).
+        columns (list): List of column names to normalize (default: the scaler's fitted columns, else all numeric).
+        scaler (MinMaxScaler): Optional scaler already fitted on training data; only transform is applied.
         
     Returns:
         pd.DataFrame: DataFrame with normalized columns.
     """
     df = df.copy()
     if columns is None:
-        columns = df.select_dtypes(include=[np.number]).columns
-    scaler = MinMaxScaler()
-    df[columns] = scaler.fit_transform(df[columns])
+        if scaler is not None and hasattr(scaler, 'feature_names_in_'):
+            columns = list(scaler.feature_names_in_)
+        else:
+            columns = df.select_dtypes(include=[np.number]).columns
+    if scaler is None:
+        scaler = MinMaxScaler()
+        df[columns] = scaler.fit_transform(df[columns])
+    else:
+        df[columns] = scaler.transform(df[columns])
     return df
 
-def encode_categorical(df, columns=None):
+def encode_categorical(df, columns=None, encoder=None, sparse=False):
     """
     One-hot encode specified categorical columns.
     
     Args:
         df (pd.DataFrame): Input DataFrame.
-        columns (list): List of column names to encode (default: all object).
+        columns (list): List of column names to encode (default: the encoder's fitted columns, else all object).
+        encoder (OneHotEncoder): Optional encoder already fitted on training data; only transform is applied.
+        sparse (bool): Keep the encoded columns as a pandas sparse block (SparseDtype) instead of dense floats.
         
     Returns:
         pd.DataFrame: DataFrame with encoded columns.
     """
     df = df.copy()
     if columns is None:
-        columns = df.select_dtypes(include=[object]).columns
-    encoder = OneHotEncoder(sparse_output=False, handle_unknown='ignore')
-    encoded = encoder.fit_transform(df[columns])
-    encoded_df = pd.DataFrame(encoded, columns=encoder.get_feature_names_out(columns))
+        if encoder is not None and hasattr(encoder, 'feature_names_in_'):
+            columns = list(encoder.feature_names_in_)
+        else:
+            columns = df.select_dtypes(include=[object, 'category']).columns
+    if encoder is None:
+        encoder = OneHotEncoder(sparse_output=sparse, handle_unknown='ignore')
+        encoded = encoder.fit_transform(df[columns])
+    else:
+        encoded = encoder.transform(df[columns])
+    names = encoder.get_feature_names_out(columns)
+    if sparse:
+        # fillna(0) keeps zeros implicit on pandas versions where from_spmatrix uses a NaN fill value
+        encoded_df = pd.DataFrame.sparse.from_spmatrix(sp.csr_matrix(encoded), index=df.index, columns=names).fillna(0)
+    else:
+        if sp.issparse(encoded):
+            encoded = encoded.toarray()
+        encoded_df = pd.DataFrame(encoded, columns=names, index=df.index)
     df = pd.concat([df.drop(columns, axis=1), encoded_df], axis=1)
     return df
+
+def compute_chunk_stats(input_path, chunksize=100000, k=200):
+    """
+    First pass of the streaming pipeline: collect global statistics from a CSV read in chunks.
+    
+    Args:
+        input_path (str): Path to the input CSV.
+        chunksize (int): Rows per chunk (default: 100000).
+        k (int): Accuracy parameter of the median sketches (default: 200).
+        
+    Returns:
+        dict: 'numeric_columns', 'categorical_columns', per-column 'median' (approximate), 'mean',
+        'min', 'max', 'value_counts' (category vocabularies with counts) and 'has_missing'.
+    """
+    sketches, value_counts = {}, {}
+    sums = counts = mins = maxs = has_missing = None
+    categorical = set()
+    for chunk in pd.read_csv(input_path, chunksize=chunksize):
+        numeric = chunk.select_dtypes(include=[np.number])
+        block = numeric.to_numpy(dtype=float)
+        for i, col in enumerate(numeric.columns):
+            sketches.setdefault(col, QuantileSketch(k=k)).update(block[:, i])
+        if sums is None:
+            sums, counts, mins, maxs = numeric.sum(), numeric.count(), numeric.min(), numeric.max()
+            has_missing = chunk.isna().any()
+        else:
+            sums = sums.add(numeric.sum(), fill_value=0)
+            counts = counts.add(numeric.count(), fill_value=0)
+            mins = pd.concat([mins, numeric.min()], axis=1).min(axis=1)
+            maxs = pd.concat([maxs, numeric.max()], axis=1).max(axis=1)
+            has_missing = has_missing | chunk.isna().any()
+        for col in chunk.select_dtypes(include=['object', 'string']).columns:
+            categorical.add(col)
+            counts_chunk = chunk[col].value_counts()
+            value_counts[col] = value_counts[col].add(counts_chunk, fill_value=0) if col in value_counts else counts_chunk
+    
+    # A column counts as numeric only if it was never read as strings and holds at least one value
+    numeric_cols = [col for col in sketches if col not in categorical and counts[col] > 0]
+    categorical_cols = [col for col in has_missing.index if col in categorical]
+    return {
+        'numeric_columns': numeric_cols,
+        'categorical_columns': categorical_cols,
+        'median': {col: sketches[col].median() for col in numeric_cols},
+        'mean': (sums[numeric_cols] / counts[numeric_cols]).to_dict(),
+        'min': mins[numeric_cols].to_dict(),
+        'max': maxs[numeric_cols].to_dict(),
+        'value_counts': {col: value_counts[col] for col in categorical_cols},
+        'has_missing': has_missing.to_dict(),
+    }
+
+def clean_csv_in_chunks(input_path, output_path, chunksize=100000, numeric_strategy='median',
+                        categorical_strategy='None', normalize=True, encode=True, stats=None):
+    """
+    Clean a CSV that may not fit in memory, writing the result chunk by chunk.
+    
+    The first pass (compute_chunk_stats) gathers medians/means, min/max and category vocabularies;
+    the second pass applies fill_missing, normalize_data and encode_categorical to each chunk with
+    those global statistics, so every chunk is transformed consistently.
+    
+    Args:
+        input_path (str): Path to the input CSV.
+        output_path (str): Output path ending with .csv or .parquet.
+        chunksize (int): Rows per chunk (default: 100000).
+        numeric_strategy (str): 'median' (approximate) or 'mean'.
+        categorical_strategy (str): 'None' or 'mode'.
+        normalize (bool): Min-Max scale numeric columns with the global min/max (default: True).
+        encode (bool): One-hot encode categorical columns with the global vocabularies (default: True).
+        stats (dict): Precomputed output of compute_chunk_stats to skip the first pass.
+        
+    Returns:
+        str: Path to the written file.
+        
+    Raises:
+        ValueError: If a strategy or the output suffix is not recognized.
+        ImportError: If pyarrow is missing for .parquet output.
+    """
+    if not output_path.endswith(('.csv', '.parquet')):
+        raise ValueError("Output path must end with .csv or .parquet")
+    if numeric_strategy not in ('median', 'mean'):
+        raise ValueError("numeric_strategy must be 'mean' or 'median'.")
+    if categorical_strategy not in ('None', 'mode'):
+        raise ValueError("categorical_strategy must be 'None' or 'mode'.")
+    if stats is None:
+        stats = compute_chunk_stats(input_path, chunksize=chunksize)
+    numeric_cols = stats['numeric_columns']
+    categorical_cols = stats['categorical_columns']
+    
+    fill_values = dict(stats[numeric_strategy])
+    vocabularies = {}
+    for col in categorical_cols:
+        counts = stats['value_counts'][col]
+        vocab = sorted(counts.index)
+        if categorical_strategy == 'mode' and len(counts):
+            fill_values[col] = counts.idxmax()
+        else:
+            # Columns without any value (e.g., an all-missing column) have no mode and get 'None' too
+            fill_values[col] = 'None'
+            if stats['has_missing'][col] and 'None' not in vocab:
+                vocab = sorted(vocab + ['None'])
+        vocabularies[col] = vocab
+    # Columns with an empty vocabulary (e.g., every column of a header-only CSV) have nothing to encode
+    encoded_cols = [col for col in categorical_cols if vocabularies[col]]
+    
+    scaler = encoder = None
+    if normalize and numeric_cols:
+        # Fitting on the global min/max rows reproduces a scaler fitted on the whole file
+        scaler = MinMaxScaler().fit(pd.DataFrame([stats['min'], stats['max']])[numeric_cols])
+    if encode and encoded_cols:
+        categories = [vocabularies[col] for col in encoded_cols]
+        encoder = OneHotEncoder(categories=categories, sparse_output=False, handle_unknown='ignore')
+        encoder.fit(pd.DataFrame({col: vocabularies[col][:1] for col in encoded_cols}))
+    
+    if output_path.endswith('.parquet'):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Missing 'pyarrow' library. Install it to save Parquet files.")
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+    
+    writer = None
+    reader = pd.read_csv(input_path, chunksize=chunksize, dtype=dict.fromkeys(categorical_cols, object))
+    for i, chunk in enumerate(reader):
+        chunk = fill_missing(chunk, inplace=True, fill_values=fill_values)
+        if scaler is not None:
+            chunk = normalize_data(chunk, numeric_cols, scaler=scaler)
+        if encoder is not None:
+            chunk = encode_categorical(chunk, encoded_cols, encoder=encoder)
+        if output_path.endswith('.csv'):
+            chunk.to_csv(output_path, mode='w' if i == 0 else 'a', header=(i == 0), index=False)
+        else:
+            # Numeric columns as float so every chunk matches the first chunk's schema
+            chunk[numeric_cols] = chunk[numeric_cols].astype(float)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output_path, table.schema)
+            writer.write_table(table.cast(writer.schema))
+    if writer is not None:
+        writer.close()
+    return output_path
+
+def cached_clean(input_path, steps=None, cache_dir='data/cache', max_bytes=1 << 30):
+    """
+    Run cleaning steps on a CSV/Parquet file, reusing the cached result when nothing changed.
+
+    Args:
+        input_path (str): Raw input file (e.g., 'data/raw/train.csv').
+        steps (list): Functions from this module, or (function, params) tuples, applied in order
+            (default: fill_missing then drop_duplicates).
+        cache_dir (str): Directory holding the Parquet artifacts.
+        max_bytes (int): Cache size limit; least recently used artifacts are evicted beyond it.
+
+    Returns:
+        pd.DataFrame: Cleaned data.
+    """
+    if steps is None:
+        steps = [fill_missing, drop_duplicates]
+    return CleaningCache(cache_dir, max_bytes=max_bytes).run(input_path, steps)
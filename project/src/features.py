@@ -0,0 +1,63 @@
+"""
+Feature engineering functions for the Housing Price Prediction Project.
+
+Functions:
+- convert_year_to_age(df, year_columns, current_year=2025, inplace=False, dtype='int16'): Converts year columns (e.g., YearBuilt)
+  to compact integer ages relative to current_year, which may be a per-row sale year (e.g., YrSold).
+  Rationale: Age captures temporal effects in housing data better than raw years.
+"""
+
+import numpy as np
+import pandas as pd
+
+AGE_COLUMN_NAMES = {
+    'yearbuilt': 'house_age', 'year_built': 'house_age', 'YearBuilt': 'house_age',
+    'yearremodadd': 'remodel_age', 'year_remod_add': 'remodel_age', 'YearRemodAdd': 'remodel_age',
+    'garageyrblt': 'garage_age', 'garage_yr_blt': 'garage_age', 'GarageYrBlt': 'garage_age',
+}
+
+def convert_year_to_age(df, year_columns, current_year=2025, inplace=False, dtype='int16'):
+    """
+    Convert year columns to age relative to current_year.
+
+    All age columns are computed in one broadcast subtraction over the year block.
+    
+    Args:
+        df (pd.DataFrame): Input DataFrame.
+        year_columns (list or dict): Year column names (e.g., ['yearbuilt', 'yearremodadd']), named via
+            AGE_COLUMN_NAMES (house_age, remodel_age, garage_age; otherwise '<col>_age'), or an explicit
+            mapping of year column -> age column (e.g., {'yearbuilt': 'house_age'}).
+        current_year (int, str or array-like): Reference year for age calculation (default: 2025); a column
+            name or per-row array/Series (e.g., 'yrsold') gives each row its own reference year.
+        inplace (bool): Add the age columns to df itself instead of a shallow copy (default: False).
+            Existing data is never copied either way.
+        dtype (str): Integer dtype of the age columns (default: 'int16'); the nullable version
+            (e.g., 'Int16', 'UInt16') is used for columns with a missing year, such as garageyrblt for houses without a garage.
+        
+    Returns:
+        pd.DataFrame: DataFrame with new age columns (e.g., house_age, remodel_age).
+        
+    Raises:
+        KeyError: If specified columns are not in DataFrame.
+    """
+    if not isinstance(year_columns, dict):
+        year_columns = {col: AGE_COLUMN_NAMES.get(col, f"{col}_age") for col in year_columns}
+    for col in year_columns:
+        if col not in df.columns:
+            raise KeyError(f"Column {col} not found in DataFrame")
+    if isinstance(current_year, str):
+        current_year = df[current_year]
+    reference = np.asarray(current_year, dtype=float)
+    if reference.ndim:
+        reference = reference[:, None]
+    ages = reference - df[list(year_columns)].to_numpy(dtype=float)
+    missing = np.isnan(ages).any(axis=0)
+    dtype = pd.api.types.pandas_dtype(dtype)
+    # Nullable counterpart of the dtype (int16 -> Int16, uint16 -> UInt16) for columns with missing years
+    nullable = pd.array(np.empty(0, dtype=getattr(dtype, 'numpy_dtype', dtype))).dtype
+    ages = pd.DataFrame(ages, index=df.index, columns=list(year_columns.values()))
+    ages = ages.astype({col: nullable if nan else dtype for col, nan in zip(ages.columns, missing)})
+    if not inplace:
+        df = df.copy(deep=False)
+    df[ages.columns] = ages
+    return df
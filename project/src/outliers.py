@@ -1,12 +1,17 @@
 import pandas as pd
 import numpy as np
 
-def detect_outliers_iqr(series: pd.Series, k: float = 1.5) -> pd.Series:
+def detect_outliers_iqr(series: pd.Series, k: float = 1.5, sketch=None) -> pd.Series:
     """Return boolean mask for IQR-based outliers.
     Assumptions: distribution reasonably summarized by quartiles; k controls strictness.
+    sketch: optional QuantileSketch (src.sketches) fed with the full/streamed column; its approximate
+    quartiles (rank error <= sketch.rank_error_bound) are used instead of sorting series.
     """
-    q1 = series.quantile(0.25)
-    q3 = series.quantile(0.75)
+    if sketch is not None:
+        q1, q3 = sketch.quantile([0.25, 0.75])
+    else:
+        q1 = series.quantile(0.25)
+        q3 = series.quantile(0.75)
     iqr = q3 - q1
     lower = q1 - k * iqr
     upper = q3 + k * iqr
@@ -21,36 +26,193 @@ def detect_outliers_zscore(series: pd.Series, threshold: float = 3.0) -> pd.Seri
     z = (series - mu) / (sigma if sigma != 0 else 1.0)
     return z.abs() > threshold
 
-def handle_outliers(df: pd.DataFrame, column: str, method: str = 'iqr', action: str = 'flag', threshold: float = 3.0, k: float = 1.5) -> pd.DataFrame:
+MAD_SCALE = 0.6745  # Phi^-1(0.75): makes the modified z-score comparable to a z-score for normal data
+
+def _partition_median(values: np.ndarray) -> np.ndarray:
+    """Column medians of a 2-D array via np.partition (O(n) selection, no full sort); NaNs are skipped."""
+    missing = np.isnan(values)
+    n = (~missing).sum(axis=0)
+    # NaNs become +inf so they are partitioned past every real value
+    filled = np.where(missing, np.inf, values)
+    lo, hi = np.maximum((n - 1) // 2, 0), np.maximum(n // 2, 0)
+    part = np.partition(filled, np.unique(np.concatenate([lo, hi])), axis=0)
+    median = (np.take_along_axis(part, lo[None, :], axis=0) + np.take_along_axis(part, hi[None, :], axis=0))[0] / 2
+    return np.where(n > 0, median, np.nan)
+
+def _mad_center_scale(values: np.ndarray):
+    """Per-column median and robust scale MAD / MAD_SCALE (mean absolute deviation fallback when MAD is 0)."""
+    median = _partition_median(values)
+    deviation = np.abs(values - median)
+    mad = _partition_median(deviation)
+    # Zero-inflated columns (e.g., PoolArea) have MAD 0; use 1.2533 * mean absolute deviation there
+    scale = np.where(mad != 0, mad / MAD_SCALE, 1.2533 * np.nanmean(deviation, axis=0))
+    return median, np.where((scale != 0) & ~np.isnan(scale), scale, 1.0)
+
+def detect_outliers_mad(series: pd.Series, threshold: float = 3.5) -> pd.Series:
+    """Return boolean mask for modified Z-score outliers: |0.6745 * (x - median) / MAD| > threshold.
+    Assumptions: none about the tails; median and MAD are barely moved by the extreme values being detected.
     """
-    Detect and handle outliers in a specified column.
-    
-    Parameters:
-    - df: DataFrame to process.
-    - column: Column name to check for outliers.
-    - method: 'iqr' or 'zscore' for detection.
-    - action: 'flag' (add boolean column), 'remove' (drop rows), or 'winsorize' (cap values).
-    - threshold: For zscore.
-    - k: For iqr.
-    
-    Returns: Modified DataFrame.
+    median, scale = _mad_center_scale(series.to_numpy(dtype=float)[:, None])
+    return (series - median[0]).abs() / scale[0] > threshold
+
+def detect_outliers_iqr_frame(df: pd.DataFrame, columns=None, k: float = 1.5, sketches: dict = None):
+    """Return (mask, bounds) for IQR-based outliers in many columns at once.
+    Quartiles for all columns come from one nanquantile call over the NumPy block, or from
+    sketches (column -> QuantileSketch, e.g. from src.sketches.sketch_columns) when given.
+    mask: boolean DataFrame (True = outlier); bounds: DataFrame indexed by column with 'lower'/'upper'.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    values = df[columns].to_numpy(dtype=float)
+    if sketches is not None:
+        q1, q3 = np.array([sketches[col].quantile([0.25, 0.75]) for col in columns]).T
+    else:
+        q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+    iqr = q3 - q1
+    lower = q1 - k * iqr
+    upper = q3 + k * iqr
+    mask = pd.DataFrame((values < lower) | (values > upper), index=df.index, columns=columns)
+    return mask, pd.DataFrame({'lower': lower, 'upper': upper}, index=columns)
+
+def detect_outliers_zscore_frame(df: pd.DataFrame, columns=None, threshold: float = 3.0):
+    """Return (mask, bounds) for Z-score outliers (|z| > threshold) in many columns at once.
+    Means and stds (ddof=0) for all columns come from one reduction over the NumPy block.
+    bounds holds the equivalent value range mean -/+ threshold * std per column.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    values = df[columns].to_numpy(dtype=float)
+    mu = np.nanmean(values, axis=0)
+    sigma = np.nanstd(values, axis=0)
+    sigma = np.where(sigma != 0, sigma, 1.0)
+    mask = pd.DataFrame(np.abs(values - mu) / sigma > threshold, index=df.index, columns=columns)
+    return mask, pd.DataFrame({'lower': mu - threshold * sigma, 'upper': mu + threshold * sigma}, index=columns)
+
+def detect_outliers_mad_frame(df: pd.DataFrame, columns=None, threshold: float = 3.5):
+    """Return (mask, bounds) for modified Z-score outliers in many columns at once.
+    Medians and MADs for all columns come from np.partition over the NumPy block (no sorting).
+    bounds holds the equivalent value range median -/+ threshold * MAD / 0.6745 per column.
     """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    values = df[columns].to_numpy(dtype=float)
+    median, scale = _mad_center_scale(values)
+    mask = pd.DataFrame(np.abs(values - median) / scale > threshold, index=df.index, columns=columns)
+    return mask, pd.DataFrame({'lower': median - threshold * scale, 'upper': median + threshold * scale}, index=columns)
+
+def detect_outliers_mad_rolling(df: pd.DataFrame, columns=None, window: int = 20, threshold: float = 3.5,
+                                block_rows: int = 4096) -> pd.DataFrame:
+    """Return boolean mask of modified Z-score outliers against the previous window bars (e.g., AAPL daily prices).
+    Rows must be in time order. As with the rolling detectors in hw7/src/outliers.py, each value is scored
+    against the median/MAD of the window bars before it; the first window rows and values whose window
+    contains NaN are not flagged. Windows are handled block_rows at a time with np.partition over a
+    strided view, so peak memory is O(block_rows * window * columns) rather than O(n * window * columns).
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=[np.number]).columns
+    values = df[columns].to_numpy(dtype=float)
+    mask = np.zeros(values.shape, dtype=bool)
+    if len(values) <= window:
+        return pd.DataFrame(mask, index=df.index, columns=columns)
+    # Window i covers rows i .. i + window - 1 and scores row i + window; (n - window, columns, window) view
+    windows = np.lib.stride_tricks.sliding_window_view(values[:-1], window, axis=0)
+    lo, hi = (window - 1) // 2, window // 2
+    for start in range(0, len(windows), block_rows):
+        block = windows[start:start + block_rows]
+        part = np.partition(block, [lo, hi], axis=-1)
+        median = (part[..., lo] + part[..., hi]) / 2
+        deviation = np.partition(np.abs(block - median[..., None]), [lo, hi], axis=-1)
+        scale = (deviation[..., lo] + deviation[..., hi]) / 2 / MAD_SCALE
+        current = values[window + start:window + start + len(block)]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.abs(current - median) / np.where(scale != 0, scale, np.nan)
+        # A flat window (MAD 0) flags any move away from its median
+        score = np.where(scale == 0, np.where(current != median, np.inf, 0.0), score)
+        mask[window + start:window + start + len(block)] = (score > threshold) & ~np.isnan(block).any(axis=-1)
+    return pd.DataFrame(mask, index=df.index, columns=columns)
+
+def fit_outlier_bounds(df: pd.DataFrame, columns=None, method: str = 'iqr', threshold: float = None, k: float = 1.5,
+                       winsor_quantiles=(0.05, 0.95), sketches: dict = None) -> pd.DataFrame:
+    """Fit outlier bounds once (e.g., on training data) for reuse with apply_outlier_bounds.
+    Returns a DataFrame indexed by column with 'lower'/'upper' detection bounds and
+    'winsor_lower'/'winsor_upper' caps for winsorizing (skipped when winsor_quantiles is None).
+    With method='iqr', sketches (column -> QuantileSketch) lets the bounds be fitted on streamed or
+    partitioned data: quartiles and caps then come from the sketches, and df only needs the columns.
+    threshold defaults to 3.0 for 'zscore' and 3.5 for 'mad'.
+    """
+    if method == 'iqr' and sketches is not None:
+        if columns is None:
+            columns = list(sketches)
+        q1, q3, lo, hi = np.array([sketches[col].quantile([0.25, 0.75, *(winsor_quantiles or (0, 1))])
+                                   for col in columns]).T
+        bounds = pd.DataFrame({'lower': q1 - k * (q3 - q1), 'upper': q3 + k * (q3 - q1)}, index=columns)
+        if winsor_quantiles is not None:
+            bounds['winsor_lower'], bounds['winsor_upper'] = lo, hi
+        return bounds
     if method == 'iqr':
-        outliers = detect_outliers_iqr(df[column], k=k)
+        _, bounds = detect_outliers_iqr_frame(df, columns, k=k)
     elif method == 'zscore':
-        outliers = detect_outliers_zscore(df[column], threshold=threshold)
+        _, bounds = detect_outliers_zscore_frame(df, columns, threshold=3.0 if threshold is None else threshold)
+    elif method == 'mad':
+        _, bounds = detect_outliers_mad_frame(df, columns, threshold=3.5 if threshold is None else threshold)
     else:
-        raise ValueError("Method must be 'iqr' or 'zscore'.")
-    
+        raise ValueError("Method must be 'iqr', 'zscore' or 'mad'.")
+    if winsor_quantiles is not None:
+        caps = np.nanquantile(df[bounds.index].to_numpy(dtype=float), list(winsor_quantiles), axis=0)
+        bounds['winsor_lower'], bounds['winsor_upper'] = caps
+    return bounds
+
+def apply_outlier_bounds(df: pd.DataFrame, bounds: pd.DataFrame, action: str = 'flag') -> pd.DataFrame:
+    """Apply fitted bounds to a new batch with plain comparisons/clip (no quantiles recomputed).
+    action: 'flag', 'remove' or 'winsorize', as in handle_outliers.
+    """
+    columns = list(bounds.index)
     if action == 'flag':
-        df[f'{column}_outlier'] = outliers
+        outliers = df[columns].lt(bounds['lower'], axis=1) | df[columns].gt(bounds['upper'], axis=1)
+        for col in columns:
+            df[f'{col}_outlier'] = outliers[col]
     elif action == 'remove':
-        df = df[~outliers]
+        outliers = df[columns].lt(bounds['lower'], axis=1) | df[columns].gt(bounds['upper'], axis=1)
+        df = df[~outliers.any(axis=1)]
     elif action == 'winsorize':
-        lo = df[column].quantile(0.05)
-        hi = df[column].quantile(0.95)
-        df[column] = df[column].clip(lower=lo, upper=hi)
+        df[columns] = df[columns].clip(lower=bounds['winsor_lower'], upper=bounds['winsor_upper'], axis=1)
     else:
         raise ValueError("Action must be 'flag', 'remove', or 'winsorize'.")
+    return df
+
+def save_outlier_bounds(bounds: pd.DataFrame, path: str) -> str:
+    """Save fitted bounds as JSON next to the model artifacts.
+    Floats keep 15 significant digits and the 'split' layout keeps non-string column labels (e.g., 1) as JSON numbers.
+    """
+    bounds.to_json(path, orient='split', double_precision=15, indent=2)
+    return path
+
+def load_outlier_bounds(path: str) -> pd.DataFrame:
+    """Load bounds saved with save_outlier_bounds, with column labels exactly as saved."""
+    bounds = pd.read_json(path, orient='split', convert_axes=False, dtype=False, precise_float=True)
+    return bounds.astype(float)
+
+def handle_outliers(df: pd.DataFrame, column, method: str = 'iqr', action: str = 'flag', threshold: float = None, k: float = 1.5,
+                    bounds: pd.DataFrame = None) -> pd.DataFrame:
+    """
+    Detect and handle outliers in one or more columns.
     
-    return df
\ No newline at end of file
+    Parameters:
+    - df: DataFrame to process.
+    - column: Column name, or list of column names, to check for outliers.
+    - method: 'iqr', 'zscore' or 'mad' (modified z-score: median/MAD, robust to heavy tails) for detection.
+    - action: 'flag' (add boolean column per checked column), 'remove' (drop rows that are an outlier
+      in any checked column), or 'winsorize' (cap values).
+    - threshold: For zscore and mad (default: 3.0 for zscore, 3.5 for mad).
+    - k: For iqr.
+    - bounds: Optional bounds from fit_outlier_bounds (e.g., fitted on training data); when given they are
+      applied as-is instead of recomputing quantiles on df, so results are consistent across batches.
+    
+    Returns: Modified DataFrame.
+    """
+    columns = list(column) if pd.api.types.is_list_like(column) else [column]
+    if bounds is None:
+        winsor_quantiles = (0.05, 0.95) if action == 'winsorize' else None
+        bounds = fit_outlier_bounds(df, columns, method=method, threshold=threshold, k=k,
+                                    winsor_quantiles=winsor_quantiles)
+    return apply_outlier_bounds(df, bounds.loc[columns], action=action)
@@ -4,71 +4,123 @@ Utility functions for the Housing Price Prediction Project.
 These functions support data preprocessing and storage tasks, ensuring consistency and usability in later stages (e.g., data cleaning, EDA, modeling).
 
 Functions:
-- clean_column_names(df): Standardizes DataFrame column names by converting to lowercase and
-  replacing spaces/special characters with underscores. Useful for consistent data handling.
+- clean_column_names(df, check_collisions=True): Standardizes DataFrame column names by converting to lowercase and
+  replacing spaces/special characters with underscores, without copying the data. Useful for consistent data handling.
   Future Use: Applied during data preprocessing to normalize column names across datasets like Kaggle train/test.csv.
 
-- convert_year_to_age(df, year_columns, current_year): Converts year columns (e.g., YearBuilt) to age relative to current_year.
+- convert_year_to_age(df, year_columns, current_year=2025, inplace=False, dtype='int16'): Converts year columns (e.g., YearBuilt)
+  to compact integer ages relative to current_year, which may be a per-row sale year (e.g., YrSold).
+  Defined in src/features.py and re-exported here.
   Future Use: Creates age-based features for modeling, capturing temporal effects in housing data.
 
-- save_data(df, filename, data_dir): Saves DataFrame to CSV in the specified directory, creating folders if needed.
+- save_data(df, filename, data_dir, compression='infer', partition_cols=None, atomic=True): Saves DataFrame to CSV or
+  (optionally partitioned) Parquet in the specified directory via an atomic temp-file rename, creating folders if needed.
   Future Use: Used for storing raw or processed data reproducibly.
 """
 
 import pandas as pd
 import os
+import re
+import shutil
+import uuid
+from collections import Counter
+from functools import lru_cache
 
-def clean_column_names(df):
+from src.features import AGE_COLUMN_NAMES, convert_year_to_age
+
+_NON_ALNUM = re.compile(r'[^a-z0-9]')
+
+@lru_cache(maxsize=256)
+def _clean_names(columns):
+    """Cleaned names for a tuple of raw column names, memoized per column set."""
+    return tuple(_NON_ALNUM.sub('_', str(col).lower()) for col in columns)
+
+def clean_column_names(df, check_collisions=True):
     """
     Standardize DataFrame column names by converting to lowercase and replacing spaces/special
     characters with underscores.
+
+    Only the column labels are replaced: the result is a shallow copy sharing the data of df, and
+    the mapping is cached for column sets seen before (e.g., every file of the same feed).
     
     Args:
         df (pd.DataFrame): Input DataFrame.
+        check_collisions (bool): Raise if two raw names map to the same cleaned name
+            (e.g., 'Lot Area' and 'lot_area').
         
     Returns:
         pd.DataFrame: DataFrame with cleaned column names.
-    """
-    df = df.copy()
-    df.columns = df.columns.str.lower().str.replace(r'[^a-z0-9]', '_', regex=True)
-    return df
 
-def convert_year_to_age(df, year_columns, current_year=2025):
-    """
-    Convert year columns to age relative to current_year.
-    
-    Args:
-        df (pd.DataFrame): Input DataFrame.
-        year_columns (list): List of year column names (e.g., ['year_built', 'year_remod_add']).
-        current_year (int): Reference year for age calculation (default: 2025).
-        
-    Returns:
-        pd.DataFrame: DataFrame with new age columns (e.g., house_age, remodel_age).
-        
     Raises:
-        KeyError: If specified columns are not in DataFrame.
+        ValueError: If check_collisions is True and cleaned names collide.
     """
-    df = df.copy()
-    for col in year_columns:
-        if col not in df.columns:
-            raise KeyError(f"Column {col} not found in DataFrame")
-        age_col = f"{col.split('_')[0]}_age"
-        df[age_col] = current_year - df[col]
+    columns = tuple(df.columns)
+    cleaned = _clean_names(columns)
+    if check_collisions and len(set(cleaned)) < len(cleaned):
+        duplicates = {name for name, count in Counter(cleaned).items() if count > 1}
+        clashes = {name: [raw for raw, new in zip(columns, cleaned) if new == name] for name in duplicates}
+        raise ValueError(f"Column names collide after cleaning: {clashes}")
+    df = df.copy(deep=False)
+    df.columns = cleaned
     return df
 
-def save_data(df, filename, data_dir):
+CSV_SUFFIXES = ('.csv', '.csv.gz', '.csv.zst', '.csv.bz2', '.csv.xz')
+
+def _replace_path(tmp_path, filepath):
+    """Move a finished temp file or dataset directory onto filepath, whatever kind of path it replaces."""
+    if os.path.isdir(filepath) or (os.path.isdir(tmp_path) and os.path.exists(filepath)):
+        # A directory cannot replace (or be replaced by) anything in one rename: move the old one aside first
+        old_path = f"{tmp_path}.old"
+        os.replace(filepath, old_path)
+        os.replace(tmp_path, filepath)
+        if os.path.isdir(old_path):
+            shutil.rmtree(old_path)
+        else:
+            os.remove(old_path)
+    else:
+        os.replace(tmp_path, filepath)
+
+def save_data(df, filename, data_dir, compression='infer', partition_cols=None, atomic=True):
     """
-    Save DataFrame to CSV in the specified directory, creating folders if needed.
+    Save DataFrame to CSV or Parquet in the specified directory, creating folders if needed.
     
     Args:
         df (pd.DataFrame): Input DataFrame.
-        filename (str): Name of the file (e.g., 'train_cleaned.csv').
+        filename (str): Name of the file (e.g., 'train_cleaned.csv', 'train_cleaned.csv.gz' or 'train_cleaned.parquet').
         data_dir (str): Directory path to save the file.
+        compression (str): Codec; for CSV 'gzip' or 'zstd' (default 'infer': from the suffix; zstd needs
+            the zstandard package), for Parquet 'snappy' (default 'infer' means snappy), 'zstd' or 'gzip'.
+            None writes uncompressed output.
+        partition_cols (list): Parquet only; write a dataset directory split by these columns
+            (e.g., ['neighborhood'] or ['yrsold']) so later stages load only the partitions they need.
+        atomic (bool): Write to a temporary path in data_dir and rename it into place, so a crashed
+            run never leaves a half-written file (default: True).
         
     Returns:
         str: Path to the saved file.
+
+    Raises:
+        ValueError: If file suffix is not .csv (optionally compressed) or .parquet, or partition_cols is used with CSV.
     """
     os.makedirs(data_dir, exist_ok=True)  # Create directory if it doesn't exist
     filepath = os.path.join(data_dir, filename)
-    df.to_csv(filepath, index=False)
-    return filepath
\ No newline at end of file
+    # Same directory (same filesystem, so the rename is atomic) and same suffix (so compression is inferred)
+    target = os.path.join(data_dir, f".tmp-{uuid.uuid4().hex[:8]}-{filename}") if atomic else filepath
+    try:
+        if filename.endswith(CSV_SUFFIXES):
+            if partition_cols:
+                raise ValueError("partition_cols is only supported for .parquet files")
+            df.to_csv(target, index=False, compression=compression)
+        elif filename.endswith('.parquet'):
+            df.to_parquet(target, index=False, compression='snappy' if compression == 'infer' else compression,
+                          partition_cols=partition_cols)
+        else:
+            raise ValueError("Filename must end with .csv or .parquet")
+        if atomic:
+            _replace_path(target, filepath)
+    finally:
+        if atomic and os.path.isdir(target):
+            shutil.rmtree(target)
+        elif atomic and os.path.exists(target):
+            os.remove(target)
+    return filepath